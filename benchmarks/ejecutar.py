@@ -0,0 +1,295 @@
+"""
+Benchmarks de clasificación, gráficos y latencia de rerun de las páginas.
+
+Uso:
+    python benchmarks/ejecutar.py                       # todo
+    python benchmarks/ejecutar.py --solo clasificacion  # un grupo
+    python benchmarks/ejecutar.py --comparar benchmarks/resultados/abc1234.json
+
+Los resultados se guardan en benchmarks/resultados/<commit>.json. Con
+--comparar se listan los casos que empeoraron más que --tolerancia respecto
+del archivo indicado y el proceso termina con código 1 si hay regresiones.
+
+Las versiones escalares (las que usan las páginas) se miden con 1 y 1000
+filas; las vectorizadas con 1, 1000 y 1 000 000. Las páginas se ejecutan con
+el AppTest de Streamlit y la API de OpenAI reemplazada por dci.simulador_openai.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIRECTORIO_RESULTADOS = Path(__file__).resolve().parent / "resultados"
+
+# El estado en disco y la API simulada deben configurarse antes de importar dci
+_temporal = tempfile.mkdtemp(prefix="dci_bench_")
+os.environ.setdefault("DCI_CACHE_DIR", os.path.join(_temporal, "cache"))
+os.environ.setdefault("DCI_DATOS_DIR", os.path.join(_temporal, "datos"))
+sys.path.insert(0, str(RAIZ))
+
+import numpy as np  # noqa: E402
+
+from dci import simulador_openai  # noqa: E402
+
+_servidor = simulador_openai.iniciar()
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{_servidor.server_port}/v1"
+
+TAMANOS_ESCALARES = (1, 1_000)
+TAMANOS_LOTE = (1, 1_000, 1_000_000)
+
+
+def medir(funcion, minimo_segundos=0.2, maximo_repeticiones=50, minimo_repeticiones=3):
+    """
+    Ejecuta funcion() varias veces (al menos minimo_repeticiones y hasta
+    acumular minimo_segundos) y devuelve las estadísticas de tiempo.
+    """
+    funcion()  # calentamiento
+    tiempos = []
+    inicio = time.perf_counter()
+    while len(tiempos) < minimo_repeticiones or (
+        time.perf_counter() - inicio < minimo_segundos and len(tiempos) < maximo_repeticiones
+    ):
+        t = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t)
+    tiempos.sort()
+    return {
+        "repeticiones": len(tiempos),
+        "mediana_s": statistics.median(tiempos),
+        "min_s": tiempos[0],
+        "p95_s": tiempos[min(int(len(tiempos) * 0.95), len(tiempos) - 1)],
+    }
+
+
+def _datos(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return {
+        "edades": rng.integers(0, 61, n),
+        "tallas": rng.uniform(45, 115, n).round(1),
+        "pesos": rng.uniform(2, 25, n).round(1),
+    }
+
+
+def grupo_clasificacion():
+    import dci
+
+    casos = {
+        "classify_dci": (
+            lambda d: [dci.classify_dci(int(e), t) for e, t in zip(d["edades"], d["tallas"])],
+            lambda d: dci.classify_dci_batch(d["edades"], d["tallas"]),
+        ),
+        "classify_dci_aproximado": (
+            lambda d: [dci.classify_dci_aproximado(int(e), t) for e, t in zip(d["edades"], d["tallas"])],
+            lambda d: dci.classify_dci_aproximado_batch(d["edades"], d["tallas"]),
+        ),
+        "clasificar_nino": (
+            lambda d: [dci.clasificar_nino(int(e), t) for e, t in zip(d["edades"], d["tallas"])],
+            lambda d: dci.clasificar_nino_batch(d["edades"], d["tallas"]),
+        ),
+        "evaluar_imc": (
+            lambda d: [dci.evaluar_imc(p, t) for p, t in zip(d["pesos"], d["tallas"])],
+            lambda d: dci.evaluar_imc_batch(d["pesos"], d["tallas"]),
+        ),
+    }
+    for nombre, (escalar, lote) in casos.items():
+        for n in TAMANOS_ESCALARES:
+            datos = _datos(n)
+            yield f"{nombre}/escalar", n, medir(lambda: escalar(datos))
+        for n in TAMANOS_LOTE:
+            datos = _datos(n)
+            yield f"{nombre}/lote", n, medir(lambda: lote(datos))
+
+    # Versión original de proyecto.py: filtro del DataFrame por cada niño
+    who_df = dci.get_who_data()
+    for n in TAMANOS_ESCALARES:
+        datos = _datos(n)
+        yield "classify_dci/filtro_dataframe", n, medir(lambda: [
+            who_df[who_df["age_months"] == e].iloc[0]["mediana_z0"] for e in datos["edades"]
+        ])
+
+
+def grupo_referencia():
+    from dci import recursos, referencia, tabla_oms
+
+    # get_who_data() solo devuelve la tabla ya construida en dci.recursos
+    yield "tabla_oms/construir_who_df", 61, medir(tabla_oms.construir_who_df)
+
+    def cargar_todas_en_frio():
+        # Sin invalidar el recurso solo se mediría la búsqueda de las tablas ya abiertas
+        recursos.invalidar("tablas_lms")
+        return referencia.cargar_todas()
+
+    yield "referencia/cargar_todas", len(referencia.INDICADORES), medir(cargar_todas_en_frio)
+    for n in TAMANOS_LOTE:
+        rng = np.random.default_rng(1)
+        sexos, dias, tallas = rng.integers(0, 2, n), rng.uniform(0, 1856, n), rng.uniform(45, 115, n)
+        yield "referencia/zscore_talla_edad", n, medir(lambda: referencia.zscore("talla_edad", sexos, dias, tallas))
+
+
+def grupo_graficos():
+    import dci
+    from dci import graficos
+
+    who_df = dci.get_who_data()
+    yield "plotly/figura_talla_edad", 1, medir(lambda: graficos.figura_talla_edad(who_df, 24, 85.0))
+    yield "plotly/figura_talla_edad_cohorte", 1_000, medir(
+        lambda: graficos.figura_talla_edad(who_df, _datos(1_000)["edades"], _datos(1_000)["tallas"])
+    )
+
+    def plotly_express_completo():
+        # Construcción original de proyecto.py, como referencia
+        import plotly.express as px
+
+        tabla = who_df.copy()
+        tabla["Z-score +2"] = tabla["mediana_z0"] + tabla["desviacion_estandar"] * 2
+        tabla["Z-score 0"] = tabla["mediana_z0"]
+        tabla["Z-score -2"] = tabla["mediana_z0"] - tabla["desviacion_estandar"] * 2
+        fig = px.line(tabla, x="age_months", y=["Z-score +2", "Z-score 0", "Z-score -2"])
+        fig.add_scatter(x=[24], y=[85.0], mode="markers")
+        return fig
+
+    yield "plotly/px_line_completo", 1, medir(plotly_express_completo)
+    yield "matplotlib/png_grupo", 1, medir(lambda: graficos.grafico_matplotlib().png(24, 85.0))
+
+    def matplotlib_completo():
+        # Construcción original de app.py (figura nueva en cada rerun)
+        import io
+
+        from matplotlib.figure import Figure
+
+        fig = Figure()
+        ax = fig.subplots()
+        ax.plot(graficos.EDAD_REF_APP, graficos.TALLA_MEDIA_REF_APP, "g--")
+        ax.fill_between(graficos.EDAD_REF_APP, graficos.TALLA_MIN_REF_APP, graficos.TALLA_MAX_REF_APP, alpha=0.2)
+        ax.plot(24, 85.0, "ro")
+        ax.legend(["a", "b", "c"])
+        fig.savefig(io.BytesIO(), format="png")
+
+    yield "matplotlib/figura_nueva", 1, medir(matplotlib_completo)
+
+
+def grupo_paginas():
+    from streamlit.testing.v1 import AppTest
+
+    def pagina(archivo, interaccion):
+        prueba = AppTest.from_file(str(RAIZ / archivo), default_timeout=60)
+        prueba.run()
+        contador = {"i": 0}
+
+        def rerun():
+            contador["i"] += 1
+            interaccion(prueba, contador["i"])
+            if prueba.exception:
+                raise RuntimeError(f"{archivo}: {prueba.exception[0].value}")
+
+        return rerun
+
+    def analizar_app(prueba, i):
+        prueba.number_input[0].set_value(24)
+        prueba.number_input[2].set_value(80.0 + i % 10)
+        prueba.button[0].click().run()
+
+    def preguntar_app(prueba, i):
+        prueba.chat_input[0].set_value(f"¿Qué alimentos tienen hierro? ({i})").run()
+
+    def analizar_proyecto(prueba, i):
+        if not prueba.text_input[0].value:
+            prueba.text_input[0].input("sk-benchmark").run()
+        # Cada repetición cambia el peso para que la caché no evite la llamada a la API
+        prueba.number_input[0].set_value(5.0 + (i % 80) * 0.5)
+        prueba.button(key="FormSubmitter:input_form-Analizar").click().run()
+
+    def analizar_registro(prueba, i):
+        prueba.text_input[0].input(f"Menor {i % 100}")
+        prueba.number_input[0].set_value(24)
+        prueba.number_input[1].set_value(11.5)
+        prueba.number_input[2].set_value(84.0)
+        prueba.button[0].click().run()
+
+    casos = (
+        ("app.py", "analizar", analizar_app),
+        ("app.py", "chat", preguntar_app),
+        ("proyecto.py", "analizar", analizar_proyecto),
+        ("streamlit_app.py", "guardar", analizar_registro),
+        ("pages/prevalencia.py", "carga", lambda prueba, i: prueba.run()),
+    )
+    for archivo, accion, interaccion in casos:
+        yield f"rerun/{archivo}:{accion}", 1, medir(pagina(archivo, interaccion), minimo_segundos=2.0, maximo_repeticiones=30)
+
+
+GRUPOS = {
+    "clasificacion": grupo_clasificacion,
+    "referencia": grupo_referencia,
+    "graficos": grupo_graficos,
+    "paginas": grupo_paginas,
+}
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "sin-commit"
+
+
+def comparar(actual, base, tolerancia):
+    """
+    Devuelve los casos cuya mediana empeoró más que 'tolerancia' (fracción).
+    """
+    anteriores = {(r["caso"], r["n"]): r for r in base["resultados"]}
+    regresiones = []
+    for r in actual["resultados"]:
+        previo = anteriores.get((r["caso"], r["n"]))
+        if previo and r["mediana_s"] > previo["mediana_s"] * (1 + tolerancia):
+            regresiones.append((r["caso"], r["n"], previo["mediana_s"], r["mediana_s"]))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de la detección de DCI")
+    parser.add_argument("--solo", choices=sorted(GRUPOS), action="append", help="grupos a ejecutar")
+    parser.add_argument("--salida", type=Path, help="archivo JSON de resultados")
+    parser.add_argument("--comparar", type=Path, help="resultados anteriores para detectar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="empeoramiento permitido (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    commit = _commit()
+    resultados = []
+    for nombre in args.solo or GRUPOS:
+        for caso, n, estadisticas in GRUPOS[nombre]():
+            resultados.append({"grupo": nombre, "caso": caso, "n": n, **estadisticas})
+            print(f"{caso:45s} n={n:>9,}  mediana={estadisticas['mediana_s'] * 1e3:10.3f} ms", flush=True)
+
+    informe = {
+        "commit": commit,
+        "fecha": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "procesadores": os.cpu_count(),
+        "resultados": resultados,
+    }
+    salida = args.salida or DIRECTORIO_RESULTADOS / f"{commit}.json"
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    salida.write_text(json.dumps(informe, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultados guardados en {salida}")
+
+    if args.comparar:
+        regresiones = comparar(informe, json.loads(args.comparar.read_text(encoding="utf-8")), args.tolerancia)
+        for caso, n, antes, ahora in regresiones:
+            print(f"REGRESIÓN {caso} n={n}: {antes * 1e3:.3f} ms -> {ahora * 1e3:.3f} ms")
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Núcleo de cálculo para la detección de desnutrición crónica infantil (DCI).
+
+Este paquete solo importa NumPy. Los módulos con dependencias pesadas
+(dci.graficos, dci.cliente_openai, dci.cohorte, dci.cache) se cargan
+únicamente cuando se importan de forma explícita.
+"""
+from dci.clasificacion import (
+    IMC_CORTE_DESNUTRICION,
+    calcular_imc,
+    clasificar_nino,
+    clasificar_nino_batch,
+    classify_dci,
+    classify_dci_aproximado,
+    classify_dci_aproximado_batch,
+    evaluar_imc,
+    evaluar_imc_batch,
+)
+from dci import metricas
+from dci.tabla_oms import TABLA_TALLA_EDAD, get_who_data
+from dci.zscore import (
+    CODIGO_FUERA_RANGO,
+    CODIGO_NORMAL,
+    CODIGO_RIESGO,
+    ESTADOS_DCI,
+    Z_CORTE_DCI,
+    classify_dci_batch,
+    classify_dci_df,
+    who_lookup_arrays,
+)
@@ -0,0 +1,3 @@
+from dci.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,182 @@
+"""
+Caché de respuestas de recomendaciones en dos niveles.
+
+- Nivel 1: LRU en memoria, compartido por todas las sesiones del proceso.
+- Nivel 2: SQLite en disco, sobrevive a los reinicios del servidor.
+
+Ambos niveles expiran por TTL y desalojan las entradas menos usadas cuando
+superan su tamaño máximo. Si varias sesiones piden la misma clave a la vez,
+solo una ejecuta la consulta y las demás esperan su resultado.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from dci import recursos
+from dci.clasificacion import banda_edad
+
+RUTA_POR_DEFECTO = Path(os.environ.get("DCI_CACHE_DIR", Path.home() / ".cache" / "dci")) / "recomendaciones.sqlite"
+
+
+def clave_perfil(age_months, weight_kg, height_cm, dci_status):
+    """
+    Clave normalizada: banda de edad, estado, peso a 0.5 kg y talla a 1 cm.
+    """
+    peso = round(float(weight_kg) * 2) / 2
+    talla = round(float(height_cm))
+    return f"{banda_edad(age_months)}|{dci_status}|{peso:.1f}|{talla:d}"
+
+
+class _Vuelo:
+    """Consulta en curso para una clave, compartida entre sesiones."""
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+
+
+class CacheRecomendaciones:
+    def __init__(self, ruta=RUTA_POR_DEFECTO, max_memoria=256, max_disco=5000, ttl_segundos=7 * 24 * 3600):
+        self.max_memoria = max_memoria
+        self.max_disco = max_disco
+        self.ttl_segundos = ttl_segundos
+        self._memoria = OrderedDict()
+        self._vuelos = {}
+        self._candado = threading.Lock()
+        self._contadores = {
+            "hits_memoria": 0,
+            "hits_disco": 0,
+            "misses": 0,
+            "compartidas": 0,
+            "consultas": 0,
+            "segundos_consulta": 0.0,
+        }
+
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(ruta), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS respuestas ("
+            " clave TEXT PRIMARY KEY, texto TEXT NOT NULL, creado REAL NOT NULL, usado REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_respuestas_usado ON respuestas (usado)")
+
+    def get(self, clave):
+        """
+        Busca una clave en memoria y luego en disco. Devuelve None si no está
+        o si ya expiró.
+        """
+        with self._candado:
+            texto = self._buscar(clave)
+            if texto is None:
+                self._contadores["misses"] += 1
+            return texto
+
+    def put(self, clave, texto):
+        """
+        Guarda una respuesta en ambos niveles y aplica el desalojo por tamaño.
+        """
+        ahora = time.time()
+        with self._candado:
+            self._guardar_en_memoria(clave, texto, ahora)
+            self._db.execute(
+                "INSERT OR REPLACE INTO respuestas (clave, texto, creado, usado) VALUES (?, ?, ?, ?)",
+                (clave, texto, ahora, ahora),
+            )
+            self._db.execute("DELETE FROM respuestas WHERE creado < ?", (ahora - self.ttl_segundos,))
+            self._db.execute(
+                "DELETE FROM respuestas WHERE clave IN ("
+                " SELECT clave FROM respuestas ORDER BY usado DESC LIMIT -1 OFFSET ?)",
+                (self.max_disco,),
+            )
+
+    def get_or_compute(self, clave, calcular):
+        """
+        Devuelve la respuesta en caché o ejecuta calcular() una sola vez por
+        clave, aunque varias sesiones la pidan al mismo tiempo. Los resultados
+        None (errores) no se guardan.
+        """
+        with self._candado:
+            texto = self._buscar(clave)
+            if texto is not None:
+                return texto
+            vuelo = self._vuelos.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._vuelos[clave] = _Vuelo()
+                self._contadores["misses"] += 1
+                self._contadores["consultas"] += 1
+            else:
+                self._contadores["compartidas"] += 1
+
+        if not lider:
+            vuelo.listo.wait()
+            return vuelo.resultado
+
+        inicio = time.perf_counter()
+        try:
+            vuelo.resultado = calcular()
+            if vuelo.resultado is not None:
+                self.put(clave, vuelo.resultado)
+        finally:
+            with self._candado:
+                self._contadores["segundos_consulta"] += time.perf_counter() - inicio
+                del self._vuelos[clave]
+            vuelo.listo.set()
+        return vuelo.resultado
+
+    def estadisticas(self):
+        """
+        Contadores de aciertos y fallos, con una estimación del tiempo ahorrado
+        (aciertos multiplicados por la latencia media de una consulta real).
+        """
+        with self._candado:
+            datos = dict(self._contadores)
+            datos["entradas_memoria"] = len(self._memoria)
+            datos["entradas_disco"] = self._db.execute("SELECT COUNT(*) FROM respuestas").fetchone()[0]
+        aciertos = datos["hits_memoria"] + datos["hits_disco"] + datos["compartidas"]
+        latencia_media = datos["segundos_consulta"] / datos["consultas"] if datos["consultas"] else 0.0
+        datos["tasa_aciertos"] = aciertos / (aciertos + datos["misses"]) if aciertos + datos["misses"] else 0.0
+        datos["segundos_ahorrados"] = aciertos * latencia_media
+        return datos
+
+    def _buscar(self, clave):
+        # Debe llamarse con el candado tomado; actualiza los contadores de aciertos
+        ahora = time.time()
+        entrada = self._memoria.get(clave)
+        if entrada is not None:
+            texto, creado = entrada
+            if ahora - creado <= self.ttl_segundos:
+                self._memoria.move_to_end(clave)
+                self._contadores["hits_memoria"] += 1
+                return texto
+            del self._memoria[clave]
+
+        fila = self._db.execute("SELECT texto, creado FROM respuestas WHERE clave = ?", (clave,)).fetchone()
+        if fila is not None:
+            texto, creado = fila
+            if ahora - creado <= self.ttl_segundos:
+                self._db.execute("UPDATE respuestas SET usado = ? WHERE clave = ?", (ahora, clave))
+                self._guardar_en_memoria(clave, texto, creado)
+                self._contadores["hits_disco"] += 1
+                return texto
+            self._db.execute("DELETE FROM respuestas WHERE clave = ?", (clave,))
+        return None
+
+    def _guardar_en_memoria(self, clave, texto, creado):
+        self._memoria[clave] = (texto, creado)
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+
+def cache_compartida():
+    """
+    Caché de recomendaciones del proceso, compartida por todas las sesiones
+    (dci.recursos).
+    """
+    return recursos.obtener("cache_recomendaciones")
@@ -0,0 +1,129 @@
+"""
+Motor de respuestas del chatbot por recuperación (TF-IDF), sin API externa.
+
+La base de conocimiento (dci/data/conocimiento.json) se indexa una sola vez
+por proceso en una matriz TF-IDF normalizada. Cada pregunta se convierte en
+un vector disperso y se compara solo con las columnas de sus términos; las
+preguntas repetidas se responden desde una caché LRU.
+"""
+import json
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from dci import recursos
+
+RUTA_CONOCIMIENTO = Path(__file__).resolve().parent / "data" / "conocimiento.json"
+
+# Puntaje mínimo (similitud coseno) para considerar que una respuesta aplica
+UMBRAL_RESPUESTA = 0.12
+
+RESPUESTA_POR_DEFECTO = (
+    "Lo siento, no tengo una respuesta específica para eso. Mi conocimiento se centra en la desnutrición "
+    "crónica infantil y su prevención. Intenta preguntar sobre la importancia de la nutrición en la primera "
+    "infancia o sobre las causas de la desnutrición."
+)
+
+PALABRAS_VACIAS = frozenset("""
+a al algo ante antes como con contra cual cuales cuando de del desde donde durante e el ella ellas ellos en
+entre era es esa ese eso esta este esto estos estas fue ha hay hasta la las le les lo los mas me mi mis muy
+no nos o os para pero poco por porque que quien se segun ser si sin sobre su sus tambien te tiene tu tus un
+una uno unos unas y ya yo puede puedo debo debe hacer hago cual cuanto cuanta cuantos cuantas hijo hija nino
+nina ninos ninas bebe mi
+""".split())
+
+
+def _normalizar(texto):
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def tokenizar(texto):
+    """
+    Minúsculas, sin tildes ni palabras vacías, y con una raíz aproximada
+    (los primeros 6 caracteres) para unir singulares, plurales y conjugaciones.
+    """
+    return [palabra[:6] for palabra in re.findall(r"[a-z0-9]+", _normalizar(texto))
+            if palabra not in PALABRAS_VACIAS and (len(palabra) > 1 or palabra.isdigit())]
+
+
+class MotorRespuestas:
+    def __init__(self, documentos):
+        self.documentos = documentos
+        # Las preguntas y el título pesan el doble que el cuerpo de la respuesta
+        textos = [
+            " ".join([doc["titulo"]] * 2 + doc["preguntas"] * 2 + [doc["respuesta"]])
+            for doc in documentos
+        ]
+        tokens = [tokenizar(texto) for texto in textos]
+        self.vocabulario = {t: i for i, t in enumerate(sorted({t for doc in tokens for t in doc}))}
+
+        frecuencias = np.zeros((len(documentos), len(self.vocabulario)), dtype=np.float32)
+        for fila, doc in enumerate(tokens):
+            for token in doc:
+                frecuencias[fila, self.vocabulario[token]] += 1
+
+        documentos_con_termino = np.count_nonzero(frecuencias, axis=0)
+        self.idf = (np.log((1 + len(documentos)) / (1 + documentos_con_termino)) + 1).astype(np.float32)
+        matriz = np.log1p(frecuencias) * self.idf
+        matriz /= np.linalg.norm(matriz, axis=1, keepdims=True)
+        # Columnas contiguas: cada consulta solo lee las columnas de sus términos
+        self.matriz = np.asfortranarray(matriz)
+
+    def buscar(self, pregunta, k=3):
+        """
+        Devuelve hasta k tuplas (puntaje, documento) ordenadas por puntaje.
+        """
+        conteo = {}
+        for token in tokenizar(pregunta):
+            indice = self.vocabulario.get(token)
+            if indice is not None:
+                conteo[indice] = conteo.get(indice, 0) + 1
+        if not conteo:
+            return []
+
+        indices = np.fromiter(conteo, dtype=np.int64)
+        pesos = np.log1p(np.fromiter(conteo.values(), dtype=np.float32)) * self.idf[indices]
+        puntajes = self.matriz[:, indices] @ (pesos / np.linalg.norm(pesos))
+
+        k = min(k, len(puntajes))
+        mejores = np.argpartition(-puntajes, k - 1)[:k]
+        mejores = mejores[np.argsort(-puntajes[mejores])]
+        return [(float(puntajes[i]), self.documentos[i]) for i in mejores if puntajes[i] > 0]
+
+
+def construir_motor():
+    """
+    Indexa la base de conocimiento y vacía la caché de respuestas anteriores.
+    """
+    with open(RUTA_CONOCIMIENTO, encoding="utf-8") as archivo:
+        nuevo = MotorRespuestas(json.load(archivo))
+    _responder_normalizada.cache_clear()
+    return nuevo
+
+
+def motor():
+    """
+    Motor del proceso, compartido en dci.recursos y reconstruido si cambia
+    la base de conocimiento.
+    """
+    return recursos.obtener("chatbot")
+
+
+@lru_cache(maxsize=2048)
+def _responder_normalizada(pregunta, k):
+    resultados = motor().buscar(pregunta, k)
+    return tuple((puntaje, doc["id"], doc["titulo"], doc["respuesta"]) for puntaje, doc in resultados)
+
+
+def responder(pregunta, k=3):
+    """
+    Respuestas para una pregunta del chat: tupla de hasta k elementos
+    (puntaje, id, titulo, respuesta) con puntaje >= UMBRAL_RESPUESTA.
+    Una tupla vacía significa que no hay una respuesta adecuada.
+    """
+    clave = " ".join(_normalizar(pregunta).split())
+    return tuple(r for r in _responder_normalizada(clave, k) if r[0] >= UMBRAL_RESPUESTA)
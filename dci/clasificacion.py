@@ -0,0 +1,164 @@
+"""
+Reglas de clasificación de las tres aplicaciones, sin dependencias de la UI.
+
+Cada regla tiene una versión para un solo niño (la que usan las páginas) y una
+versión vectorizada para lotes.
+"""
+import numpy as np
+
+from dci.zscore import ESTADOS_DCI, classify_dci_batch
+
+# Bandas de edad (meses) para agrupar perfiles y prevalencias
+BANDAS_EDAD = ((0, 5), (6, 11), (12, 23), (24, 35), (36, 47), (48, 60))
+
+
+def banda_edad(age_months):
+    """
+    Devuelve la banda de edad como texto, por ejemplo "12-23". La edad se
+    cuenta en meses cumplidos: 5.5 está en "0-5" y 23.9 en "12-23".
+    """
+    for inicio, fin in BANDAS_EDAD:
+        if inicio <= age_months < fin + 1:
+            return f"{inicio}-{fin}"
+    return f"{int(age_months)}"
+
+
+# --- proyecto.py: talla para la edad ---
+
+def classify_dci(age_months, height_cm, who_df=None):
+    """
+    Clasifica el riesgo de DCI usando el Z-score real de la OMS.
+    Envoltura de un solo niño sobre classify_dci_batch.
+    """
+    _, codigos = classify_dci_batch([age_months], [height_cm], who_df)
+    return ESTADOS_DCI[int(codigos[0])]
+
+
+def expected_height_aproximada(age_months):
+    """
+    Talla esperada del modelo simplificado: aprox. 2.5 cm/mes hasta los
+    2 años y 0.7 cm/mes después.
+    """
+    edades = np.asarray(age_months, dtype=np.float64)
+    return np.where(edades <= 24, 49.9 + edades * 2.5, 90 + (edades - 24) * 0.7)
+
+
+def classify_dci_aproximado(age_months, height_cm):
+    """
+    Clasifica el riesgo de desnutrición crónica infantil (DCI)
+    basado en un modelo simplificado de talla para la edad.
+
+    NOTA: Para un uso real, se necesitarían las tablas de la OMS y un cálculo preciso del Z-score.
+    Este es un modelo de reglas simplificado para el proyecto.
+    """
+    # Umbral simplificado: 90% de la talla esperada. Un umbral más preciso sería un Z-score < -2.
+    if height_cm < (float(expected_height_aproximada(age_months)) * 0.9):
+        return "Riesgo de Desnutrición Crónica"
+    else:
+        return "Normal"
+
+
+def classify_dci_aproximado_batch(age_months, height_cm):
+    """
+    Versión vectorizada de classify_dci_aproximado. Devuelve un arreglo booleano
+    que es True para los niños con riesgo de DCI.
+    """
+    return np.asarray(height_cm, dtype=np.float64) < expected_height_aproximada(age_months) * 0.9
+
+
+# --- app.py: rangos ilustrativos de talla ---
+
+# Estos valores son puramente ilustrativos y no corresponden a percentiles reales de la OMS.
+TALLAS_REFERENCIA = {
+    # 'edad_meses': [talla_min_referencia, talla_max_referencia]
+    12: [70, 78],
+    24: [80, 88],
+    36: [88, 96],
+    48: [95, 103],
+    60: [100, 110],
+}
+
+MENSAJES_CLASIFICACION = {
+    "bajo": "El niño o niña presenta **desnutrición crónica**. Su estatura está significativamente por debajo de lo normal para su edad. 😥",
+    "alto": "El niño o niña presenta un crecimiento superior al promedio para su edad. Se recomienda seguimiento médico. 😊",
+    "normal": "El niño o niña presenta un crecimiento normal para su edad. Sigue así. 🎉",
+}
+
+
+def clasificar_nino(edad_meses, estatura_cm):
+    """
+    Simula una clasificación de desnutrición crónica basada en reglas de la OMS.
+    (Simplificado para fines del proyecto)
+    """
+    if edad_meses not in TALLAS_REFERENCIA:
+        return "Fuera del rango de edad analizado (1-5 años).", None
+
+    talla_min, talla_max = TALLAS_REFERENCIA[edad_meses]
+
+    if estatura_cm < talla_min:
+        estado = "bajo"
+    elif estatura_cm > talla_max:
+        estado = "alto"
+    else:
+        estado = "normal"
+    return MENSAJES_CLASIFICACION[estado], estado
+
+
+# Arreglos indexados por edad para la versión por lotes (NaN = edad sin referencia)
+_TALLA_MIN = np.full(61, np.nan)
+_TALLA_MAX = np.full(61, np.nan)
+for _edad, (_minima, _maxima) in TALLAS_REFERENCIA.items():
+    _TALLA_MIN[_edad] = _minima
+    _TALLA_MAX[_edad] = _maxima
+
+# Códigos de clasificar_nino_batch
+CODIGO_SIN_REFERENCIA = -1
+CODIGO_BAJO = 0
+CODIGO_NORMAL_APP = 1
+CODIGO_ALTO = 2
+
+
+def clasificar_nino_batch(edad_meses, estatura_cm):
+    """
+    Versión vectorizada de clasificar_nino. Devuelve códigos int8:
+    CODIGO_BAJO, CODIGO_NORMAL_APP, CODIGO_ALTO o CODIGO_SIN_REFERENCIA.
+    """
+    edades = np.asarray(edad_meses)
+    estaturas = np.asarray(estatura_cm, dtype=np.float64)
+    indices = np.where((edades >= 0) & (edades < len(_TALLA_MIN)), edades, 0).astype(np.int64)
+    talla_min = _TALLA_MIN[indices]
+    talla_max = _TALLA_MAX[indices]
+
+    codigos = np.full(estaturas.shape, CODIGO_NORMAL_APP, dtype=np.int8)
+    codigos[estaturas < talla_min] = CODIGO_BAJO
+    codigos[estaturas > talla_max] = CODIGO_ALTO
+    codigos[np.isnan(talla_min) | (indices != edades)] = CODIGO_SIN_REFERENCIA
+    return codigos
+
+
+# --- streamlit_app.py: índice de masa corporal ---
+
+IMC_CORTE_DESNUTRICION = 14.0
+
+
+def calcular_imc(peso_kg, estatura_cm):
+    """
+    Índice de masa corporal (kg/m²). Acepta valores sueltos o arreglos.
+    """
+    return np.asarray(peso_kg, dtype=np.float64) / ((np.asarray(estatura_cm, dtype=np.float64) / 100) ** 2)
+
+
+def evaluar_imc(peso_kg, estatura_cm):
+    """
+    Devuelve (imc, presenta_desnutricion) para un niño.
+    """
+    imc = float(calcular_imc(peso_kg, estatura_cm))
+    return imc, imc < IMC_CORTE_DESNUTRICION
+
+
+def evaluar_imc_batch(peso_kg, estatura_cm):
+    """
+    Versión vectorizada de evaluar_imc: devuelve (imc, presenta_desnutricion).
+    """
+    imc = calcular_imc(peso_kg, estatura_cm)
+    return imc, imc < IMC_CORTE_DESNUTRICION
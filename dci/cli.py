@@ -0,0 +1,265 @@
+"""
+Tamizaje de encuestas completas desde la línea de comandos.
+
+El archivo se divide en partes de tamaño fijo (bytes para CSV, grupos de filas
+para Parquet) que se clasifican en un grupo de procesos con classify_dci_df y
+la tabla de la OMS por defecto (la misma de get_who_data). Cada parte se
+escribe en su propio archivo part-NNNNN, así que la salida es idéntica sea
+cual sea la cantidad de procesos.
+
+    python -m dci encuesta.csv --salida resultados/ --procesos 8
+
+Antes de clasificar, cada parte pasa por dci.validacion; las filas con
+errores van a cuarentena-NNNNN con sus motivos. Las visitas duplicadas se
+detectan primero dentro de cada parte; al terminar, el proceso principal
+compara las claves de todas las partes y, para cada visita repetida en
+partes distintas, deja solo la primera en el orden del archivo.
+
+Los CSV se cortan por saltos de línea: no se admiten campos entre comillas
+con saltos de línea dentro.
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dci.cohorte import columnas_requeridas, crear_validador
+from dci.validacion import MOTIVOS, VISITA_DUPLICADA
+from dci.zscore import CODIGO_FUERA_RANGO, CODIGO_NORMAL, CODIGO_RIESGO, classify_dci_df
+
+BYTES_POR_PARTE = 32 * 1024 * 1024
+FORMATOS = ("csv", "parquet")
+
+
+def _es_parquet(ruta):
+    return ruta.lower().endswith((".parquet", ".pq"))
+
+
+def planificar(ruta, bytes_por_parte=BYTES_POR_PARTE):
+    """
+    Divide el archivo en partes que solo dependen del archivo y del tamaño de
+    parte. Devuelve (columnas, partes); para CSV cada parte es un rango
+    (inicio, fin) de bytes y para Parquet el índice de un grupo de filas.
+    """
+    if _es_parquet(ruta):
+        import pyarrow.parquet as pq
+
+        metadatos = pq.ParquetFile(ruta).metadata
+        return metadatos.schema.names, list(range(metadatos.num_row_groups))
+
+    with open(ruta, "rb") as archivo:
+        encabezado = archivo.readline()
+        inicio_datos = archivo.tell()
+    tamano = os.path.getsize(ruta)
+    cortes = list(range(inicio_datos, tamano, bytes_por_parte)) + [tamano]
+    # csv.reader acepta nombres entre comillas, como los escribe write.csv de R
+    columnas = next(csv.reader([encabezado.decode("utf-8-sig").strip()]), [])
+    return columnas, list(zip(cortes[:-1], cortes[1:]))
+
+
+def _leer_parte(ruta, parte, encabezado):
+    """
+    Lee una parte como DataFrame. Una parte CSV contiene las líneas que
+    empiezan dentro de su rango de bytes.
+    """
+    import pandas as pd
+
+    if _es_parquet(ruta):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(ruta).read_row_group(parte).to_pandas()
+
+    inicio, fin = parte
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio - 1)
+        # Si el rango empieza a mitad de una línea, esa línea es de la parte anterior
+        archivo.readline()
+        datos = archivo.read(max(fin - archivo.tell(), 0))
+        if datos and not datos.endswith(b"\n"):
+            datos += archivo.readline()
+    return pd.read_csv(io.BytesIO(encabezado + datos))
+
+
+def _procesar_parte(tarea):
+    """
+    Clasifica una parte y la escribe en su archivo. Se ejecuta en un proceso hijo.
+    """
+    ruta, numero, parte, encabezado, col_edad, col_estatura, carpeta, formato, validar = tarea
+    inicio = time.perf_counter()
+    bloque = _leer_parte(ruta, parte, encabezado)
+    validacion = claves = None
+    if validar:
+        validador = crear_validador(bloque.columns)
+        bloque, rechazadas = validador.validar(bloque)
+        _escribir(rechazadas, os.path.join(carpeta, f"cuarentena-{numero:05d}.{formato}"), formato)
+        validacion = validador.reporte()
+        claves = validador.claves_validas
+
+    puntuado = classify_dci_df(bloque, age_col=col_edad, height_col=col_estatura)
+    _escribir(puntuado, os.path.join(carpeta, f"part-{numero:05d}.{formato}"), formato)
+
+    codigos = puntuado["dci_codigo"].to_numpy()
+    return {
+        "filas": len(puntuado),
+        "normal": int(np.count_nonzero(codigos == CODIGO_NORMAL)),
+        "riesgo": int(np.count_nonzero(codigos == CODIGO_RIESGO)),
+        "fuera_rango": int(np.count_nonzero(codigos == CODIGO_FUERA_RANGO)),
+        "validacion": validacion,
+        "claves": claves,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def _escribir(datos, destino, formato):
+    if formato == "parquet":
+        datos.to_parquet(destino, index=False)
+    else:
+        datos.to_csv(destino, index=False)
+
+
+def _leer(origen, formato):
+    import pandas as pd
+
+    return pd.read_parquet(origen) if formato == "parquet" else pd.read_csv(origen)
+
+
+def _quitar_duplicados_entre_partes(carpeta, formato, claves_por_parte, totales):
+    """
+    Deja solo la primera visita (en el orden del archivo) de cada clave que se
+    repite en partes distintas. Las siguientes se quitan de su part-NNNNN, se
+    agregan a su cuarentena-NNNNN y se descuentan de los totales. Solo se
+    reescriben las partes que tienen duplicados.
+    """
+    import pandas as pd
+
+    tamanos = [len(claves) for claves in claves_por_parte]
+    repetidas = pd.Series(np.concatenate(claves_por_parte)).duplicated().to_numpy()
+    if not repetidas.any():
+        return
+    motivo = MOTIVOS[VISITA_DUPLICADA]
+    for numero, marcadas in enumerate(np.split(repetidas, np.cumsum(tamanos)[:-1])):
+        if not marcadas.any():
+            continue
+        ruta_parte = os.path.join(carpeta, f"part-{numero:05d}.{formato}")
+        ruta_cuarentena = os.path.join(carpeta, f"cuarentena-{numero:05d}.{formato}")
+        puntuado = _leer(ruta_parte, formato)
+        quitadas = puntuado[marcadas]
+        _escribir(puntuado[~marcadas], ruta_parte, formato)
+        nuevas = quitadas.drop(columns=["z_score", "dci_codigo", "dci_status"]).assign(motivos=motivo)
+        _escribir(pd.concat([_leer(ruta_cuarentena, formato), nuevas], ignore_index=True), ruta_cuarentena, formato)
+
+        codigos = quitadas["dci_codigo"].to_numpy()
+        cantidad = len(quitadas)
+        totales["filas"] -= cantidad
+        totales["normal"] -= int(np.count_nonzero(codigos == CODIGO_NORMAL))
+        totales["riesgo"] -= int(np.count_nonzero(codigos == CODIGO_RIESGO))
+        totales["fuera_rango"] -= int(np.count_nonzero(codigos == CODIGO_FUERA_RANGO))
+        totales["validacion"]["validas"] -= cantidad
+        totales["validacion"]["cuarentena"] += cantidad
+        totales["validacion"]["motivos"][motivo] += cantidad
+
+
+def ejecutar(ruta, carpeta, procesos=None, bytes_por_parte=BYTES_POR_PARTE, formato="csv", validar=True):
+    """
+    Clasifica el archivo completo y devuelve los totales con las métricas de
+    rendimiento (filas por segundo y MB por segundo). Con validar, los totales
+    incluyen el reporte de validación sumado de todas las partes.
+    """
+    inicio = time.perf_counter()
+    columnas, partes = planificar(ruta, bytes_por_parte)
+    col_edad, col_estatura = columnas_requeridas(columnas)
+
+    encabezado = b""
+    if not _es_parquet(ruta):
+        with open(ruta, "rb") as archivo:
+            encabezado = archivo.readline()
+
+    os.makedirs(carpeta, exist_ok=True)
+    tareas = [
+        (ruta, numero, parte, encabezado, col_edad, col_estatura, carpeta, formato, validar)
+        for numero, parte in enumerate(partes)
+    ]
+    procesos = procesos or os.cpu_count() or 1
+    totales = {"filas": 0, "normal": 0, "riesgo": 0, "fuera_rango": 0, "segundos_cpu": 0.0, "validacion": None}
+    if procesos == 1:
+        claves_por_parte = _acumular(map(_procesar_parte, tareas), totales)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as grupo:
+            claves_por_parte = _acumular(grupo.map(_procesar_parte, tareas), totales)
+    if claves_por_parte and all(claves is not None for claves in claves_por_parte):
+        _quitar_duplicados_entre_partes(carpeta, formato, claves_por_parte, totales)
+
+    segundos = time.perf_counter() - inicio
+    evaluados = totales["normal"] + totales["riesgo"]
+    totales.update({
+        "partes": len(partes),
+        "procesos": procesos,
+        "segundos": segundos,
+        "filas_por_segundo": totales["filas"] / segundos if segundos else 0.0,
+        "mb_por_segundo": os.path.getsize(ruta) / 1e6 / segundos if segundos else 0.0,
+        "prevalencia": totales["riesgo"] / evaluados if evaluados else 0.0,
+    })
+    return totales
+
+
+def _acumular(resultados, totales):
+    """
+    Suma los resultados de las partes en totales y devuelve la lista de
+    claves de visita de cada parte, en orden.
+    """
+    claves_por_parte = []
+    for resultado in resultados:
+        claves_por_parte.append(resultado["claves"])
+        for campo in ("filas", "normal", "riesgo", "fuera_rango"):
+            totales[campo] += resultado[campo]
+        totales["segundos_cpu"] += resultado["segundos"]
+        validacion = resultado["validacion"]
+        if validacion is None:
+            continue
+        if totales["validacion"] is None:
+            totales["validacion"] = {"filas": 0, "validas": 0, "cuarentena": 0, "motivos": dict.fromkeys(validacion["motivos"], 0)}
+        for campo in ("filas", "validas", "cuarentena"):
+            totales["validacion"][campo] += validacion[campo]
+        for motivo, cantidad in validacion["motivos"].items():
+            totales["validacion"]["motivos"][motivo] += cantidad
+    return claves_por_parte
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog="python -m dci", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("entrada", help="archivo CSV o Parquet con edad en meses y estatura en cm")
+    parser.add_argument("--salida", default="dci_resultados", help="carpeta para los archivos part-NNNNN")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument("--mb-por-parte", type=float, default=BYTES_POR_PARTE / 1024 / 1024,
+                        help="tamaño de cada parte CSV en MB (Parquet usa sus grupos de filas)")
+    parser.add_argument("--formato", choices=FORMATOS, default="csv", help="formato de los archivos de salida")
+    parser.add_argument("--sin-validar", action="store_true", help="clasificar sin separar filas con errores")
+    args = parser.parse_args(argumentos)
+
+    try:
+        totales = ejecutar(
+            args.entrada, args.salida, args.procesos, int(args.mb_por_parte * 1024 * 1024), args.formato,
+            validar=not args.sin_validar,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Filas clasificadas:  {totales['filas']:,} en {totales['partes']} partes ({totales['procesos']} procesos)")
+    print(f"Riesgo de DCI:       {totales['riesgo']:,} (prevalencia {totales['prevalencia']:.1%})")
+    print(f"Fuera de rango:      {totales['fuera_rango']:,}")
+    validacion = totales["validacion"]
+    if validacion is not None:
+        print(f"En cuarentena:       {validacion['cuarentena']:,} de {validacion['filas']:,} filas leídas")
+        for motivo, cantidad in validacion["motivos"].items():
+            if cantidad:
+                print(f"  - {motivo}: {cantidad:,}")
+    print(f"Tiempo:              {totales['segundos']:.2f} s ({totales['segundos_cpu']:.2f} s sumando los procesos)")
+    print(f"Rendimiento:         {totales['filas_por_segundo']:,.0f} filas/s, {totales['mb_por_segundo']:.1f} MB/s")
+    print(f"Resultados en:       {args.salida}")
+    return 0
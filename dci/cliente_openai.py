@@ -0,0 +1,126 @@
+"""
+Cliente HTTP para generar recomendaciones con la API de chat completions.
+
+Todas las sesiones comparten una misma requests.Session con conexiones
+keep-alive, tiempos límite de conexión y lectura, y reintentos con espera
+exponencial ante respuestas 429 y 5xx. Las respuestas pueden recibirse en
+streaming (Server-Sent Events) para mostrarlas con st.write_stream.
+"""
+import json
+import os
+
+from dci import recursos
+
+URL_BASE = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
+MODELO = "gpt-4o"
+
+TIMEOUT_CONEXION = 3.05
+TIMEOUT_LECTURA = 30.0
+REINTENTOS = 3
+ESPERA_REINTENTO = 0.5
+ESTADOS_REINTENTO = (429, 500, 502, 503, 504)
+TAMANO_POOL = 20
+
+
+def construir_sesion():
+    """
+    Sesión HTTP con conexiones keep-alive y reintentos ante 429 y 5xx. Se
+    construye una vez por proceso en dci.recursos.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    reintentos = Retry(
+        total=REINTENTOS,
+        connect=REINTENTOS,
+        read=False,  # los tiempos límite de lectura se propagan como Timeout, sin reintento
+        backoff_factor=ESPERA_REINTENTO,
+        status_forcelist=ESTADOS_REINTENTO,
+        allowed_methods=frozenset(["POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adaptador = HTTPAdapter(pool_connections=TAMANO_POOL, pool_maxsize=TAMANO_POOL, max_retries=reintentos)
+    sesion = requests.Session()
+    sesion.mount("https://", adaptador)
+    sesion.mount("http://", adaptador)
+    return sesion
+
+
+def sesion_compartida():
+    """
+    Devuelve la sesión HTTP del proceso (dci.recursos).
+    """
+    return recursos.obtener("sesion_http")
+
+
+def construir_mensajes(age_months, weight_kg, height_cm, dci_status):
+    """
+    Mensajes del chat para pedir una guía de alimentación personalizada.
+    """
+    prompt = (
+        f"Un niño de {age_months} meses de edad, que pesa {weight_kg} kg y mide {height_cm} cm, "
+        f"ha sido clasificado con un estado de salud de '{dci_status}'. "
+        f"Basado en esta información y en los estándares nutricionales para niños de esta edad, "
+        "por favor, genera una guía práctica y personalizada de alimentación que incluya recomendaciones de alimentos, "
+        "frecuencias y porciones, adaptadas al contexto de una comunidad rural en Ecuador, con énfasis en alimentos locales."
+    )
+    return [
+        {"role": "system", "content": "Eres un experto en nutrición infantil que provee recomendaciones prácticas."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+class ClienteRecomendaciones:
+    """
+    Cliente liviano: guarda la clave y la configuración, y usa la sesión
+    compartida del proceso para todas las solicitudes.
+    """
+
+    def __init__(self, api_key, url_base=None, modelo=MODELO, timeout_conexion=TIMEOUT_CONEXION,
+                 timeout_lectura=TIMEOUT_LECTURA, temperatura=0.7):
+        self.api_key = api_key
+        self.url = (url_base or URL_BASE).rstrip("/") + "/chat/completions"
+        self.modelo = modelo
+        self.timeout = (timeout_conexion, timeout_lectura)
+        self.temperatura = temperatura
+
+    def _post(self, mensajes, stream):
+        respuesta = sesion_compartida().post(
+            self.url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": self.modelo,
+                "messages": mensajes,
+                "temperature": self.temperatura,
+                "stream": stream,
+            },
+            timeout=self.timeout,
+            stream=stream,
+        )
+        respuesta.raise_for_status()
+        return respuesta
+
+    def completar(self, mensajes):
+        """
+        Devuelve el texto completo de la respuesta.
+        """
+        respuesta = self._post(mensajes, stream=False)
+        return respuesta.json()["choices"][0]["message"]["content"]
+
+    def transmitir(self, mensajes):
+        """
+        Genera los fragmentos de texto a medida que llegan (streaming SSE).
+        """
+        respuesta = self._post(mensajes, stream=True)
+        with respuesta:
+            for linea in respuesta.iter_lines(decode_unicode=False):
+                if not linea.startswith(b"data:"):
+                    continue
+                datos = linea[5:].strip()
+                if datos == b"[DONE]":
+                    break
+                fragmento = json.loads(datos)["choices"][0].get("delta", {}).get("content")
+                if fragmento:
+                    yield fragmento
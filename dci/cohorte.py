@@ -0,0 +1,139 @@
+"""
+Tamizaje de cohortes por bloques (CSV o Parquet).
+
+El archivo se lee por partes, cada bloque se clasifica con classify_dci_batch
+y se escribe de inmediato en un CSV de salida, de modo que el uso de memoria
+depende del tamaño del bloque y no del tamaño del archivo. Opcionalmente cada
+bloque pasa antes por dci.validacion y las filas con errores se escriben en
+un CSV de cuarentena.
+"""
+from contextlib import ExitStack
+
+import numpy as np
+
+from dci.validacion import Validador
+from dci.zscore import CODIGO_FUERA_RANGO, CODIGO_NORMAL, CODIGO_RIESGO, classify_dci_df
+
+TAMANO_BLOQUE = 50_000
+
+# Nombres de columna aceptados para la edad y la estatura
+ALIAS_EDAD = ("age_months", "edad_meses", "edad")
+ALIAS_ESTATURA = ("height_cm", "estatura_cm", "talla_cm", "estatura", "talla")
+# Columnas opcionales que usa la validación
+ALIAS_PESO = ("weight_kg", "peso_kg", "peso")
+ALIAS_SEXO = ("sex", "sexo")
+ALIAS_ID = ("child_id", "nino_id", "codigo", "id")
+ALIAS_FECHA = ("fecha", "fecha_visita", "date", "visit_date")
+
+
+def _buscar_columna(columnas, alias):
+    normalizadas = {str(c).strip().lower(): c for c in columnas}
+    for nombre in alias:
+        if nombre in normalizadas:
+            return normalizadas[nombre]
+    return None
+
+
+def iter_bloques(archivo, nombre_archivo, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Recorre un archivo CSV o Parquet por bloques de DataFrame.
+
+    Genera tuplas (bloque, fraccion_leida) donde fraccion_leida es una
+    estimación entre 0 y 1 del avance sobre el archivo.
+    """
+    import pandas as pd
+
+    if nombre_archivo.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(archivo)
+        total = max(parquet.metadata.num_rows, 1)
+        leidas = 0
+        for lote in parquet.iter_batches(batch_size=tamano_bloque):
+            leidas += lote.num_rows
+            yield lote.to_pandas(), leidas / total
+        return
+
+    archivo.seek(0, 2)
+    tamano = max(archivo.tell(), 1)
+    archivo.seek(0)
+    with pd.read_csv(archivo, chunksize=tamano_bloque) as lector:
+        for bloque in lector:
+            yield bloque, min(archivo.tell() / tamano, 1.0)
+
+
+def columnas_requeridas(columnas):
+    """
+    Devuelve las columnas de edad y estatura, o ValueError si faltan.
+    """
+    col_edad = _buscar_columna(columnas, ALIAS_EDAD)
+    col_estatura = _buscar_columna(columnas, ALIAS_ESTATURA)
+    if col_edad is None or col_estatura is None:
+        raise ValueError(
+            "El archivo debe tener columnas de edad en meses "
+            f"({', '.join(ALIAS_EDAD)}) y estatura en cm ({', '.join(ALIAS_ESTATURA)})."
+        )
+    return col_edad, col_estatura
+
+
+def crear_validador(columnas):
+    """
+    Validador para un archivo con estas columnas (peso, sexo, código y fecha
+    se usan si están presentes).
+    """
+    col_edad, col_estatura = columnas_requeridas(columnas)
+    return Validador(
+        col_edad,
+        col_estatura,
+        col_peso=_buscar_columna(columnas, ALIAS_PESO),
+        col_sexo=_buscar_columna(columnas, ALIAS_SEXO),
+        col_id=_buscar_columna(columnas, ALIAS_ID),
+        col_fecha=_buscar_columna(columnas, ALIAS_FECHA),
+    )
+
+
+def screen_cohort(bloques, who_df, ruta_salida, ruta_cuarentena=None):
+    """
+    Clasifica una secuencia de bloques y los agrega al CSV de ruta_salida.
+    Con ruta_cuarentena, las filas que no pasan la validación se escriben
+    ahí (con sus motivos) en lugar de clasificarse.
+
+    Es un generador: después de cada bloque entrega un diccionario con el
+    avance y los conteos acumulados para mostrar prevalencias parciales.
+    """
+    conteos = {CODIGO_NORMAL: 0, CODIGO_RIESGO: 0, CODIGO_FUERA_RANGO: 0}
+    filas = 0
+    col_edad = col_estatura = validador = None
+
+    with ExitStack() as pila:
+        salida = pila.enter_context(open(ruta_salida, "w", newline="", encoding="utf-8"))
+        if ruta_cuarentena:
+            cuarentena = pila.enter_context(open(ruta_cuarentena, "w", newline="", encoding="utf-8"))
+        for numero, (bloque, fraccion) in enumerate(bloques):
+            if col_edad is None:
+                col_edad, col_estatura = columnas_requeridas(bloque.columns)
+                if ruta_cuarentena:
+                    validador = crear_validador(bloque.columns)
+
+            if validador is not None:
+                bloque, rechazadas = validador.validar(bloque)
+                rechazadas.to_csv(cuarentena, header=(numero == 0), index=False)
+
+            puntuado = classify_dci_df(bloque, who_df, age_col=col_edad, height_col=col_estatura)
+            puntuado.to_csv(salida, header=(numero == 0), index=False)
+
+            codigos, cantidades = np.unique(puntuado["dci_codigo"].to_numpy(), return_counts=True)
+            for codigo, cantidad in zip(codigos, cantidades):
+                conteos[int(codigo)] += int(cantidad)
+            filas += len(puntuado)
+
+            evaluados = conteos[CODIGO_NORMAL] + conteos[CODIGO_RIESGO]
+            yield {
+                "avance": fraccion,
+                "filas": filas,
+                "normal": conteos[CODIGO_NORMAL],
+                "riesgo": conteos[CODIGO_RIESGO],
+                "fuera_rango": conteos[CODIGO_FUERA_RANGO],
+                "prevalencia": conteos[CODIGO_RIESGO] / evaluados if evaluados else 0.0,
+                "validacion": validador.reporte() if validador is not None else None,
+            }
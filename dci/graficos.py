@@ -0,0 +1,153 @@
+"""
+Gráficos de crecimiento con las curvas de referencia construidas una sola vez.
+
+Las curvas estáticas se generan la primera vez que se piden y se reutilizan en
+todas las sesiones del proceso; en cada solicitud solo se agrega el punto del
+niño (o los puntos de una cohorte). Plotly y matplotlib se importan solo al
+crear el primer gráfico.
+"""
+import hashlib
+import io
+import queue
+import threading
+
+import numpy as np
+
+from dci import recursos
+
+# Curvas ilustrativas de app.py (talla mínima y máxima por edad)
+EDAD_REF_APP = np.arange(12, 61, 12)
+TALLA_MIN_REF_APP = np.array([70, 80, 88, 95, 100])
+TALLA_MAX_REF_APP = np.array([78, 88, 96, 103, 110])
+TALLA_MEDIA_REF_APP = (TALLA_MIN_REF_APP + TALLA_MAX_REF_APP) / 2
+
+_bases_plotly = {}
+_candado = threading.Lock()
+
+
+def _clave_referencia(who_df):
+    h = hashlib.blake2b(digest_size=16)
+    for columna in ("age_months", "mediana_z0", "desviacion_estandar"):
+        h.update(np.ascontiguousarray(who_df[columna].to_numpy(dtype=np.float64)).tobytes())
+    return h.hexdigest()
+
+
+def _base_plotly(who_df):
+    clave = _clave_referencia(who_df)
+    base = _bases_plotly.get(clave)
+    if base is None:
+        import plotly.graph_objects as go
+
+        edades = who_df["age_months"].to_numpy()
+        mediana = who_df["mediana_z0"].to_numpy(dtype=np.float64)
+        desviacion = who_df["desviacion_estandar"].to_numpy(dtype=np.float64)
+        curvas = (
+            ("Máximo (Z-score +2)", mediana + 2 * desviacion, "blue"),
+            ("Normal (Z-score 0)", mediana, "green"),
+            ("Umbral DCI (Z-score -2)", mediana - 2 * desviacion, "orange"),
+        )
+        trazas = tuple(
+            go.Scatter(x=edades, y=valores, mode="lines", name=nombre, line=dict(color=color))
+            for nombre, valores, color in curvas
+        )
+        layout = go.Layout(
+            title="Estatura del Niño en Comparación con los Estándares de la OMS",
+            xaxis_title="Edad (meses)",
+            yaxis_title="Estatura (cm)",
+            legend_title="Curva de Crecimiento",
+        )
+        base = (trazas, layout)
+        with _candado:
+            _bases_plotly.setdefault(clave, base)
+    return base
+
+
+def figura_talla_edad(who_df, edades, tallas, nombre="Estatura del Niño"):
+    """
+    Figura de Plotly con las curvas de referencia y los puntos indicados.
+    edades y tallas pueden ser un solo valor o arreglos (cohorte).
+    """
+    import plotly.graph_objects as go
+
+    trazas, layout = _base_plotly(who_df)
+    edades = np.atleast_1d(edades)
+    tallas = np.atleast_1d(tallas)
+    tamano = 15 if len(edades) == 1 else 6
+    punto = go.Scatter(x=edades, y=tallas, mode="markers", name=nombre, marker=dict(color="red", size=tamano))
+    return go.Figure(data=(*trazas, punto), layout=layout)
+
+
+class GraficoMatplotlib:
+    """
+    Figuras de matplotlib reutilizables: las curvas de referencia se dibujan
+    una sola vez por figura y en cada solicitud solo se actualizan los datos
+    del marcador. Las figuras forman un grupo pequeño que se comparte entre
+    todos los hilos (Streamlit usa un hilo nuevo en cada rerun): cada png()
+    toma una figura libre y la devuelve al terminar, y solo se crea otra si
+    todas están ocupadas y aún no hay FIGURAS_MAXIMAS. Las figuras no se
+    registran en pyplot, así que no se acumulan en memoria.
+    """
+
+    FIGURAS_MAXIMAS = 4
+
+    def __init__(self, figuras_maximas=FIGURAS_MAXIMAS):
+        self.figuras_maximas = figuras_maximas
+        self.creadas = 0
+        self._libres = queue.Queue()
+        self._candado = threading.Lock()
+
+    def _crear_figura(self):
+        from matplotlib.figure import Figure
+
+        figura = Figure()
+        ax = figura.subplots()
+        ax.plot(EDAD_REF_APP, TALLA_MEDIA_REF_APP, "g--", label="Talla Media OMS")
+        ax.fill_between(EDAD_REF_APP, TALLA_MIN_REF_APP, TALLA_MAX_REF_APP, color="green", alpha=0.2, label="Rango Normal OMS")
+        (marcador,) = ax.plot([], [], "ro", markersize=10, label="Talla del Niño/a")
+        ax.set_xlabel("Edad (meses)")
+        ax.set_ylabel("Estatura (cm)")
+        ax.set_title("Comparación con Estándares de la OMS")
+        ax.legend()
+        ax.grid(True)
+        return figura, ax, marcador
+
+    def _tomar(self):
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._candado:
+            crear = self.creadas < self.figuras_maximas
+            if crear:
+                self.creadas += 1
+        if crear:
+            return self._crear_figura()
+        return self._libres.get()
+
+    def png(self, edades, tallas):
+        """
+        Dibuja los puntos sobre una figura libre del grupo y devuelve la
+        imagen PNG.
+        """
+        edades = np.atleast_1d(edades)
+        tallas = np.atleast_1d(tallas)
+        figura, ax, marcador = self._tomar()
+        try:
+            buffer = io.BytesIO()
+            marcador.set_data(edades, tallas)
+            marcador.set_markersize(10 if len(edades) == 1 else 4)
+            ax.relim()
+            ax.autoscale_view()
+            figura.savefig(buffer, format="png")
+            return buffer.getvalue()
+        finally:
+            marcador.set_data([], [])
+            self._libres.put((figura, ax, marcador))
+
+
+def grafico_matplotlib():
+    """
+    Devuelve el gráfico de matplotlib del proceso (dci.recursos), con su
+    grupo de figuras.
+    """
+    return recursos.obtener("grafico_matplotlib")
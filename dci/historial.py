@@ -0,0 +1,156 @@
+"""
+Historial de chat acotado para las sesiones de Streamlit.
+
+En memoria solo se guarda una ventana de los últimos mensajes como tuplas
+(rol, texto). Los mensajes que salen de la ventana se pasan a una base SQLite
+compartida por el proceso y se cargan por páginas solo cuando el usuario pide
+"ver mensajes anteriores". Así, el costo de cada rerun depende del tamaño de la
+ventana y no del largo de la conversación.
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+from dci import recursos
+
+RUTA_POR_DEFECTO = Path(os.environ.get("DCI_CACHE_DIR", Path.home() / ".cache" / "dci")) / "historial_chat.sqlite"
+VENTANA_POR_DEFECTO = int(os.environ.get("DCI_VENTANA_CHAT", 20))
+TAMANO_PAGINA = 20
+
+# Conversaciones sin actividad durante este tiempo se borran del disco; la
+# limpieza corre al pasar mensajes a disco, como mucho una vez por hora
+RETENCION_SEGUNDOS = 2 * 24 * 3600
+PURGA_CADA_SEGUNDOS = 3600
+
+ROLES = ("user", "assistant")
+_CODIGO_ROL = {rol: codigo for codigo, rol in enumerate(ROLES)}
+
+
+class _AlmacenMensajes:
+    def __init__(self, ruta):
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._candado = threading.Lock()
+        self._db = sqlite3.connect(str(ruta), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS mensajes ("
+            " sesion TEXT NOT NULL, n INTEGER NOT NULL, rol INTEGER NOT NULL, texto TEXT NOT NULL,"
+            " creado REAL NOT NULL, PRIMARY KEY (sesion, n)) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_mensajes_creado ON mensajes (creado)")
+        self._ultima_purga = 0.0
+
+    def _purgar(self, ahora):
+        # Debe llamarse con el candado tomado
+        if ahora - self._ultima_purga >= PURGA_CADA_SEGUNDOS:
+            self._db.execute("DELETE FROM mensajes WHERE creado < ?", (ahora - RETENCION_SEGUNDOS,))
+            self._ultima_purga = ahora
+
+    def guardar(self, sesion, n, rol, texto):
+        ahora = time.time()
+        with self._candado:
+            self._purgar(ahora)
+            self._db.execute("INSERT OR REPLACE INTO mensajes VALUES (?, ?, ?, ?, ?)", (sesion, n, rol, texto, ahora))
+
+    def leer(self, sesion, desde, hasta):
+        with self._candado:
+            return self._db.execute(
+                "SELECT rol, texto FROM mensajes WHERE sesion = ? AND n >= ? AND n < ? ORDER BY n",
+                (sesion, desde, hasta),
+            ).fetchall()
+
+    def borrar(self, sesion):
+        with self._candado:
+            self._db.execute("DELETE FROM mensajes WHERE sesion = ?", (sesion,))
+
+
+def construir_almacen():
+    """
+    Base SQLite de mensajes antiguos en RUTA_POR_DEFECTO. Se construye una vez
+    por proceso en dci.recursos.
+    """
+    return _AlmacenMensajes(RUTA_POR_DEFECTO)
+
+
+def _almacen_compartido():
+    return recursos.obtener("almacen_chat")
+
+
+class HistorialChat:
+    """
+    Historial de una sesión: ventana en memoria + mensajes antiguos en disco.
+    """
+
+    def __init__(self, ventana=VENTANA_POR_DEFECTO, tamano_pagina=TAMANO_PAGINA):
+        self.sesion = uuid.uuid4().hex
+        self.tamano_pagina = tamano_pagina
+        # La ventana guarda al menos el último mensaje
+        self._recientes = deque(maxlen=max(int(ventana), 1))
+        self.total = 0
+
+    @property
+    def en_disco(self):
+        """Número de mensajes que ya salieron de la ventana en memoria."""
+        return self.total - len(self._recientes)
+
+    def agregar(self, rol, texto):
+        if len(self._recientes) == self._recientes.maxlen:
+            rol_antiguo, texto_antiguo = self._recientes[0]
+            _almacen_compartido().guardar(self.sesion, self.en_disco, rol_antiguo, texto_antiguo)
+        self._recientes.append((_CODIGO_ROL[rol], texto))
+        self.total += 1
+
+    def recientes(self):
+        """
+        Mensajes de la ventana como tuplas (rol, texto), del más antiguo al más nuevo.
+        """
+        return [(ROLES[rol], texto) for rol, texto in self._recientes]
+
+    def anteriores(self, paginas):
+        """
+        Las últimas 'paginas' páginas de mensajes guardados en disco, en orden
+        cronológico, como tuplas (rol, texto).
+        """
+        hasta = self.en_disco
+        desde = max(hasta - paginas * self.tamano_pagina, 0)
+        if paginas <= 0 or hasta == 0:
+            return []
+        return [(ROLES[rol], texto) for rol, texto in _almacen_compartido().leer(self.sesion, desde, hasta)]
+
+    def limpiar(self):
+        _almacen_compartido().borrar(self.sesion)
+        self._recientes.clear()
+        self.total = 0
+
+
+def _cargar_mensajes_anteriores():
+    import streamlit as st
+
+    st.session_state.paginas_chat += 1
+
+
+def mostrar_historial():
+    """
+    Muestra el historial de chat de la sesión de Streamlit con st.chat_message,
+    creándolo la primera vez, y lo devuelve. Los mensajes que ya pasaron a
+    disco solo se leen cuando el usuario pulsa "Ver mensajes anteriores".
+    """
+    import streamlit as st
+
+    if "messages" not in st.session_state:
+        st.session_state.messages = HistorialChat()
+        st.session_state.paginas_chat = 0
+
+    historial = st.session_state.messages
+    ocultos = historial.en_disco - st.session_state.paginas_chat * historial.tamano_pagina
+    if ocultos > 0:
+        st.button(f"Ver mensajes anteriores ({ocultos} ocultos)", on_click=_cargar_mensajes_anteriores)
+    for rol, contenido in historial.anteriores(st.session_state.paginas_chat) + historial.recientes():
+        with st.chat_message(rol):
+            st.markdown(contenido)
+    return historial
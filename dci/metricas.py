@@ -0,0 +1,180 @@
+"""
+Instrumentación liviana de cada rerun de las páginas.
+
+Uso en una página de Streamlit:
+
+    metricas.iniciar_pagina("proyecto.py")
+    with metricas.span("clasificacion"):
+        ...
+    metricas.mostrar_panel()
+
+iniciar_pagina() y mostrar_panel() envuelven iniciar_rerun() y
+finalizar_rerun(), que también sirven fuera de Streamlit.
+
+Si el rerun no está activo, span() devuelve un contexto vacío reutilizado y no
+se mide ni se escribe nada. Con el rerun activo, los tramos se acumulan en
+histogramas del proceso y se agrega una línea JSON al archivo de métricas
+(DCI_METRICAS_RUTA). DCI_METRICAS=1 activa la exportación aunque el panel esté
+oculto.
+"""
+import bisect
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from dci import recursos
+
+RUTA_POR_DEFECTO = Path(os.environ.get(
+    "DCI_METRICAS_RUTA", Path(os.environ.get("DCI_CACHE_DIR", Path.home() / ".cache" / "dci")) / "metricas.jsonl"
+))
+EXPORTAR_SIEMPRE = os.environ.get("DCI_METRICAS", "") == "1"
+
+# Límites superiores de los buckets de los histogramas, en milisegundos
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_NULO = contextlib.nullcontext()
+_local = threading.local()
+_candado = threading.Lock()
+_histogramas = {}
+_contadores = {}
+
+
+class _Span:
+    __slots__ = ("nombre", "tramos", "inicio")
+
+    def __init__(self, nombre, tramos):
+        self.nombre = nombre
+        self.tramos = tramos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tramos.append((self.nombre, time.perf_counter() - self.inicio))
+        return False
+
+
+def iniciar_rerun(pagina, activo=False):
+    """
+    Comienza la medición de un rerun en el hilo actual.
+    """
+    if activo or EXPORTAR_SIEMPRE:
+        _local.rerun = (pagina, [], time.perf_counter())
+    else:
+        _local.rerun = None
+
+
+def activo():
+    """
+    Indica si el rerun del hilo actual se está midiendo.
+    """
+    return getattr(_local, "rerun", None) is not None
+
+
+def span(nombre):
+    """
+    Contexto que mide un tramo del rerun actual (no hace nada si no está activo).
+    """
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        return _NULO
+    return _Span(nombre, rerun[1])
+
+
+def contar(nombre, cantidad=1):
+    """
+    Incrementa un contador del proceso (por ejemplo, timeouts de la API).
+    """
+    with _candado:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+
+def _observar(nombre, segundos):
+    histograma = _histogramas.get(nombre)
+    if histograma is None:
+        histograma = _histogramas[nombre] = {"buckets": [0] * (len(BUCKETS_MS) + 1), "suma_ms": 0.0, "cantidad": 0}
+    milisegundos = segundos * 1000
+    histograma["buckets"][bisect.bisect_left(BUCKETS_MS, milisegundos)] += 1
+    histograma["suma_ms"] += milisegundos
+    histograma["cantidad"] += 1
+
+
+def finalizar_rerun(contadores_extra=None, ruta=None):
+    """
+    Cierra el rerun actual: actualiza los histogramas, agrega una línea al
+    archivo de métricas y devuelve la lista de tramos [(nombre, segundos)].
+    contadores_extra permite adjuntar contadores externos (p. ej. de la caché).
+    """
+    rerun = getattr(_local, "rerun", None)
+    _local.rerun = None
+    if rerun is None:
+        return []
+
+    pagina, tramos, inicio = rerun
+    tramos.append(("total", time.perf_counter() - inicio))
+    with _candado:
+        for nombre, segundos in tramos:
+            _observar(f"{pagina}:{nombre}", segundos)
+        linea = {
+            "ts": time.time(),
+            "pagina": pagina,
+            "tramos_ms": {nombre: round(segundos * 1000, 3) for nombre, segundos in tramos},
+            "contadores": {**_contadores, **(contadores_extra or {})},
+            "histogramas": {
+                "buckets_ms": BUCKETS_MS,
+                **{nombre: dict(h, buckets=list(h["buckets"])) for nombre, h in _histogramas.items()},
+            },
+        }
+        ruta = Path(ruta or RUTA_POR_DEFECTO)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, "a", encoding="utf-8") as archivo:
+            archivo.write(json.dumps(linea, ensure_ascii=False) + "\n")
+    return tramos
+
+
+def histogramas():
+    """
+    Copia de los histogramas acumulados en el proceso.
+    """
+    with _candado:
+        return {nombre: dict(h, buckets=list(h["buckets"])) for nombre, h in _histogramas.items()}
+
+
+def iniciar_pagina(pagina):
+    """
+    Comienzo común de las páginas: muestra el interruptor del panel de
+    perfilado e inicia la medición de los tiempos por etapa del rerun, que
+    solo se registran con el panel activo. Después calienta los recursos
+    compartidos del proceso: la primera ejecución los construye y las
+    siguientes solo revisan si cambió algún archivo de origen.
+    """
+    import streamlit as st
+
+    _local.panel = st.sidebar.toggle("Panel de perfilado", key="perfilado")
+    iniciar_rerun(pagina, activo=_local.panel)
+    with span("recursos"):
+        recursos.calentar()
+
+
+def mostrar_panel(contadores_extra=None):
+    """
+    Cierra el rerun iniciado con iniciar_pagina() y, con el panel activo,
+    muestra en la barra lateral los tiempos por etapa y la memoria de los
+    recursos compartidos. contadores_extra es una función que devuelve
+    contadores para adjuntar; solo se llama si el rerun se mide.
+    """
+    import streamlit as st
+
+    tramos = finalizar_rerun(contadores_extra() if contadores_extra is not None and activo() else None)
+    if getattr(_local, "panel", False):
+        st.sidebar.dataframe(
+            [{"etapa": nombre, "ms": round(segundos * 1000, 2)} for nombre, segundos in tramos],
+            hide_index=True,
+        )
+        st.sidebar.dataframe(recursos.reporte_memoria(), hide_index=True)
+    _local.panel = False
+    return tramos
@@ -0,0 +1,129 @@
+"""
+Recomendaciones con presupuesto de latencia.
+
+La guía precalculada para la banda de edad y el estado nutricional se muestra
+de inmediato; la respuesta del modelo se pide en streaming en un hilo aparte.
+Si el primer fragmento llega dentro del presupuesto, la respuesta reemplaza a
+la guía y se sigue mostrando a medida que llega (Transmision). Si llega tarde,
+el hilo termina igual y la respuesta queda en caché para la próxima consulta
+del mismo perfil. El catálogo se genera con scripts/generar_guias.py.
+"""
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturoVencido
+
+from dci import recursos
+from dci.clasificacion import banda_edad
+
+RUTA_GUIAS = os.path.join(os.path.dirname(__file__), "data", "guias.json")
+PRESUPUESTO_SEGUNDOS = float(os.environ.get("DCI_PRESUPUESTO_RECOMENDACION", "6"))
+HILOS_CONSULTA = 8
+
+GUIA_POR_DEFECTO = (
+    "**Recomendaciones Generales:**\n"
+    "- **Consultar a un pediatra** para una evaluación completa.\n"
+    "- **Dieta balanceada y variada** con alimentos de la zona."
+)
+
+
+def guias():
+    """
+    Catálogo de guías {"banda|estado": texto}, compartido en dci.recursos.
+    """
+    return recursos.obtener("guias")
+
+
+def estado_guia(dci_status):
+    """
+    Reduce el estado de cualquiera de las apps a "riesgo", "normal" u "otro".
+    """
+    estado = (dci_status or "").lower()
+    if "riesgo" in estado or "bajo" in estado or "desnutrición" in estado:
+        return "riesgo"
+    if "normal" in estado:
+        return "normal"
+    return "otro"
+
+
+def guia_local(age_months, dci_status):
+    """
+    Guía precalculada para la edad y el estado; no hace ninguna llamada de red.
+    """
+    return guias().get(f"{banda_edad(age_months)}|{estado_guia(dci_status)}", GUIA_POR_DEFECTO)
+
+
+def construir_ejecutor():
+    """
+    Grupo de hilos para las consultas al modelo. Se construye una vez por
+    proceso en dci.recursos.
+    """
+    return ThreadPoolExecutor(max_workers=HILOS_CONSULTA, thread_name_prefix="dci-recomendacion")
+
+
+def en_segundo_plano(funcion, *args):
+    """
+    Ejecuta funcion(*args) en el grupo de hilos compartido y devuelve el Future.
+    """
+    return recursos.obtener("ejecutor_recomendaciones").submit(funcion, *args)
+
+
+def esperar(futuro, segundos):
+    """
+    Espera el resultado hasta `segundos`. Devuelve (resultado, a_tiempo);
+    las excepciones de la consulta se propagan.
+    """
+    try:
+        return futuro.result(timeout=max(segundos, 0.0)), True
+    except FuturoVencido:
+        return None, False
+
+
+class Transmision:
+    """
+    Puente entre una consulta en streaming, que corre en el grupo de hilos, y
+    la página: los fragmentos pasan por una cola, y la página puede esperar
+    solo el primero antes de decidir si muestra la respuesta o la guía.
+    """
+
+    _FIN = object()
+
+    def __init__(self):
+        self._cola = queue.Queue()
+        self._inicio = threading.Event()
+        self.comenzada = False
+
+    def consumir(self, fragmentos):
+        """
+        Lee los fragmentos en el hilo de la consulta, los pasa a la página y
+        devuelve el texto completo (None si no llegó nada).
+        """
+        partes = []
+        try:
+            for fragmento in fragmentos:
+                partes.append(fragmento)
+                self._cola.put(fragmento)
+                if not self.comenzada:
+                    self.comenzada = True
+                    self._inicio.set()
+        finally:
+            self._cola.put(self._FIN)
+        return "".join(partes) or None
+
+    def esperar_inicio(self, futuro, segundos):
+        """
+        Espera hasta `segundos` el primer fragmento o el fin de la consulta
+        (un error, o el resultado de otra sesión que ya la estaba haciendo).
+        Devuelve self.comenzada: True si hay fragmentos que mostrar con
+        fragmentos(); si es False y el futuro terminó, su resultado ya está.
+        """
+        futuro.add_done_callback(lambda _: self._inicio.set())
+        self._inicio.wait(max(segundos, 0.0))
+        return self.comenzada
+
+    def fragmentos(self):
+        """
+        Genera los fragmentos a medida que llegan, hasta el final de la respuesta.
+        """
+        while (fragmento := self._cola.get()) is not self._FIN:
+            yield fragmento
@@ -0,0 +1,241 @@
+"""
+Recursos compartidos por todas las sesiones del proceso.
+
+Cada recurso (tablas de referencia, índice del chatbot, figura de matplotlib,
+imagen de portada, cachés y bases SQLite, sesión HTTP, grupo de hilos) se
+construye una sola vez y se reutiliza en todas las sesiones y reruns. Cada uno declara una versión: una cadena fija
+o, para los que salen de un archivo, la fecha y el tamaño del archivo.
+verificar() descarta los recursos cuya versión cambió, y el siguiente
+obtener() los reconstruye.
+
+Las apps llaman a calentar() al inicio: la primera ejecución del proceso
+construye todo y las siguientes solo revisan las versiones.
+"""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+DIRECTORIO_DATOS = Path(__file__).resolve().parent / "data"
+RUTA_BANNER = DIRECTORIO_DATOS / "static" / "banner.png"
+
+_registro = {}
+_candado = threading.RLock()
+
+
+class _Recurso:
+    def __init__(self, fabrica, version):
+        self.fabrica = fabrica
+        self.version = version
+        self.objeto = None
+        self.version_cargada = None
+        self.segundos_carga = 0.0
+
+    def version_actual(self):
+        return self.version() if callable(self.version) else self.version
+
+
+def version_archivo(*rutas):
+    """
+    Versión basada en la fecha de modificación y el tamaño de uno o más
+    archivos.
+    """
+    def version_de(ruta):
+        try:
+            estado = os.stat(ruta)
+        except OSError:
+            return "ausente"
+        return f"{estado.st_mtime_ns}-{estado.st_size}"
+
+    def version():
+        return "|".join(version_de(ruta) for ruta in rutas)
+    return version
+
+
+def registrar(nombre, fabrica, version="1"):
+    """
+    Declara un recurso. fabrica() lo construye; version es una cadena o una
+    función que la devuelve.
+    """
+    with _candado:
+        _registro[nombre] = _Recurso(fabrica, version)
+
+
+def obtener(nombre):
+    """
+    Devuelve el recurso, construyéndolo la primera vez (o tras invalidarlo).
+    """
+    recurso = _registro[nombre]
+    if recurso.version_cargada is None:
+        with _candado:
+            if recurso.version_cargada is None:
+                inicio = time.perf_counter()
+                version = recurso.version_actual()
+                recurso.objeto = recurso.fabrica()
+                recurso.segundos_carga = time.perf_counter() - inicio
+                recurso.version_cargada = version
+    return recurso.objeto
+
+
+def invalidar(nombre=None):
+    """
+    Descarta un recurso (o todos) para que se reconstruya en el próximo uso.
+    Quien ya tenga el objeto anterior puede seguir usándolo.
+    """
+    with _candado:
+        for recurso in ([_registro[nombre]] if nombre else _registro.values()):
+            recurso.version_cargada = None
+
+
+def verificar():
+    """
+    Invalida los recursos cargados cuya versión cambió y devuelve sus nombres.
+    """
+    cambiados = [
+        nombre for nombre, recurso in list(_registro.items())
+        if recurso.version_cargada is not None and recurso.version_actual() != recurso.version_cargada
+    ]
+    for nombre in cambiados:
+        invalidar(nombre)
+    return cambiados
+
+
+def calentar(nombres=None):
+    """
+    Revisa versiones y construye los recursos que falten. Devuelve los
+    segundos de carga de los recursos construidos en esta llamada.
+    """
+    verificar()
+    construidos = {}
+    for nombre in nombres or list(_registro):
+        if _registro[nombre].version_cargada is None:
+            obtener(nombre)
+            construidos[nombre] = _registro[nombre].segundos_carga
+    return construidos
+
+
+def _tamano(objeto, vistos, profundidad=0):
+    if id(objeto) in vistos or profundidad > 6:
+        return 0
+    vistos.add(id(objeto))
+    if hasattr(objeto, "nbytes") and hasattr(objeto, "dtype"):
+        return int(objeto.nbytes)
+    if hasattr(objeto, "memory_usage") and hasattr(objeto, "columns"):
+        return int(objeto.memory_usage(deep=True).sum())
+    tamano = sys.getsizeof(objeto)
+    if isinstance(objeto, dict):
+        tamano += sum(_tamano(k, vistos, profundidad + 1) + _tamano(v, vistos, profundidad + 1) for k, v in objeto.items())
+    elif isinstance(objeto, (list, tuple, set, frozenset)):
+        tamano += sum(_tamano(v, vistos, profundidad + 1) for v in objeto)
+    elif hasattr(objeto, "__dict__") and not isinstance(objeto, type):
+        tamano += _tamano(vars(objeto), vistos, profundidad + 1)
+    return tamano
+
+
+def reporte_memoria():
+    """
+    Memoria estimada de cada recurso cargado, de mayor a menor. Los arreglos
+    mapeados desde disco cuentan su tamaño completo aunque no estén en RAM.
+    """
+    filas = []
+    for nombre, recurso in list(_registro.items()):
+        cargado = recurso.version_cargada is not None
+        filas.append({
+            "recurso": nombre,
+            "cargado": cargado,
+            "bytes": _tamano(recurso.objeto, set()) if cargado else 0,
+            "segundos_carga": round(recurso.segundos_carga, 4),
+            "version": recurso.version_cargada or "",
+        })
+    return sorted(filas, key=lambda fila: -fila["bytes"])
+
+
+# --- Recursos de la aplicación ---
+
+def _tabla_oms():
+    from dci.tabla_oms import construir_who_df
+
+    return construir_who_df()
+
+
+def _talla_edad():
+    from dci.tabla_oms import TABLA_TALLA_EDAD
+    from dci.zscore import who_lookup_arrays
+
+    return who_lookup_arrays(TABLA_TALLA_EDAD)
+
+
+def _tablas_lms():
+    from dci.referencia import leer_tablas
+
+    return leer_tablas()
+
+
+def _guias():
+    import json
+
+    from dci.recomendaciones import RUTA_GUIAS
+
+    with open(RUTA_GUIAS, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def _motor_chatbot():
+    from dci.chatbot import construir_motor
+
+    return construir_motor()
+
+
+def _grafico_matplotlib():
+    from dci.graficos import GraficoMatplotlib
+
+    return GraficoMatplotlib()
+
+
+def _banner():
+    return RUTA_BANNER.read_bytes()
+
+
+def _cache_recomendaciones():
+    from dci.cache import CacheRecomendaciones
+
+    return CacheRecomendaciones()
+
+
+def _registro_mediciones():
+    from dci.registro import RegistroMediciones
+
+    return RegistroMediciones()
+
+
+def _almacen_chat():
+    from dci.historial import construir_almacen
+
+    return construir_almacen()
+
+
+def _sesion_http():
+    from dci.cliente_openai import construir_sesion
+
+    return construir_sesion()
+
+
+def _ejecutor_recomendaciones():
+    from dci.recomendaciones import construir_ejecutor
+
+    return construir_ejecutor()
+
+
+registrar("tabla_oms", _tabla_oms)
+registrar("talla_edad", _talla_edad)
+registrar("tablas_lms", _tablas_lms, version_archivo(*sorted((DIRECTORIO_DATOS / "oms").glob("*.npy"))))
+registrar("guias", _guias, version_archivo(DIRECTORIO_DATOS / "guias.json"))
+registrar("chatbot", _motor_chatbot, version_archivo(DIRECTORIO_DATOS / "conocimiento.json"))
+registrar("grafico_matplotlib", _grafico_matplotlib)
+registrar("banner", _banner, version_archivo(RUTA_BANNER))
+registrar("cache_recomendaciones", _cache_recomendaciones)
+registrar("registro_mediciones", _registro_mediciones)
+registrar("almacen_chat", _almacen_chat)
+registrar("sesion_http", _sesion_http)
+registrar("ejecutor_recomendaciones", _ejecutor_recomendaciones)
@@ -0,0 +1,137 @@
+"""
+Tablas de referencia LMS de la OMS (Patrones de Crecimiento Infantil 2006).
+
+Las tablas se guardan en dci/data/oms como arreglos float32 contiguos con forma
+(sexo, fila, [L, M, S]). Se cargan una sola vez por proceso (recurso
+"tablas_lms" de dci.recursos) mediante np.load(mmap_mode="r"), de modo que
+todas las sesiones comparten las mismas páginas de memoria; si los archivos
+cambian en el disco, el recurso se vuelve a cargar. Las consultas interpolan linealmente entre filas y aceptan
+arreglos completos.
+"""
+from pathlib import Path
+
+import numpy as np
+
+from dci import recursos
+
+DIRECTORIO_TABLAS = Path(__file__).resolve().parent / "data" / "oms"
+
+DIAS_POR_MES = 365.25 / 12
+
+SEXO_MASCULINO = 0
+SEXO_FEMENINO = 1
+
+# indicador -> (primer valor del eje, paso, unidad del eje, basado en peso)
+INDICADORES = {
+    "talla_edad": (0.0, 1.0, "días", False),
+    "peso_edad": (0.0, 1.0, "días", True),
+    "peso_longitud": (45.0, 0.1, "cm", True),
+    "peso_talla": (65.0, 0.1, "cm", True),
+    "imc_edad": (0.0, 1.0, "días", True),
+}
+
+
+def leer_tablas():
+    """
+    Abre todas las tablas desde el disco. Es la fábrica del recurso
+    "tablas_lms"; para consultarlas use cargar_tabla() o cargar_todas().
+    """
+    return {indicador: np.load(DIRECTORIO_TABLAS / f"{indicador}.npy", mmap_mode="r") for indicador in INDICADORES}
+
+
+def cargar_tabla(indicador):
+    """
+    Devuelve el arreglo LMS de un indicador, cargándolo la primera vez.
+    """
+    if indicador not in INDICADORES:
+        raise KeyError(f"Indicador desconocido: {indicador!r}. Opciones: {', '.join(INDICADORES)}")
+    return recursos.obtener("tablas_lms")[indicador]
+
+
+def cargar_todas():
+    """
+    Carga todas las tablas por adelantado (por ejemplo, al iniciar el servidor).
+    """
+    return recursos.obtener("tablas_lms")
+
+
+def codificar_sexo(sexo):
+    """
+    Convierte valores de sexo a los códigos SEXO_MASCULINO / SEXO_FEMENINO.
+
+    Acepta enteros (0/1), o textos como "M", "H", "masculino", "niño", "F",
+    "femenino" o "niña" (sin distinguir mayúsculas).
+    """
+    valores = np.asarray(sexo)
+    if valores.dtype.kind in "iub":
+        return valores.astype(np.int8)
+    texto = np.char.lower(np.char.strip(valores.astype(str)))
+    codigos = np.full(texto.shape, -1, dtype=np.int8)
+    codigos[np.isin(texto, ("m", "h", "masculino", "hombre", "niño", "nino", "male", "boy"))] = SEXO_MASCULINO
+    codigos[np.isin(texto, ("f", "femenino", "mujer", "niña", "nina", "female", "girl"))] = SEXO_FEMENINO
+    return codigos
+
+
+def lms(indicador, sexo, eje):
+    """
+    Interpola los parámetros L, M y S para cada par (sexo, valor del eje).
+
+    El eje es la edad en días o la longitud/talla en cm según el indicador.
+    Devuelve tres arreglos; los valores fuera de la tabla quedan como NaN.
+    """
+    tabla = cargar_tabla(indicador)
+    inicio, paso, _, _ = INDICADORES[indicador]
+    sexo = np.asarray(sexo, dtype=np.int64)
+    posicion = (np.asarray(eje, dtype=np.float64) - inicio) / paso
+
+    n_filas = tabla.shape[1]
+    valido = (posicion >= 0) & (posicion <= n_filas - 1) & ((sexo == SEXO_MASCULINO) | (sexo == SEXO_FEMENINO))
+    posicion = np.where(valido, posicion, 0.0)
+    sexo = np.where(valido, sexo, 0)
+
+    fila = np.minimum(np.floor(posicion).astype(np.int64), n_filas - 2)
+    fraccion = (posicion - fila)[..., np.newaxis]
+    valores = tabla[sexo, fila] * (1.0 - fraccion) + tabla[sexo, fila + 1] * fraccion
+    valores[~valido] = np.nan
+    return valores[..., 0], valores[..., 1], valores[..., 2]
+
+
+def _medida_en_z(l, m, s, z):
+    return m * np.power(1.0 + l * s * z, 1.0 / l)
+
+
+def zscore(indicador, sexo, eje, medida):
+    """
+    Calcula el Z-score LMS de la OMS para arreglos completos.
+
+    Para los indicadores basados en peso se aplica el ajuste de la OMS por
+    encima de +3 DE y por debajo de -3 DE.
+    """
+    l, m, s = lms(indicador, sexo, eje)
+    medida = np.asarray(medida, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(
+            np.abs(l) < 1e-12,
+            np.log(medida / m) / s,
+            (np.power(medida / m, l) - 1.0) / (l * s),
+        )
+        # Solo las pocas filas más allá de ±3 DE necesitan el ajuste
+        extremos = np.abs(z) > 3
+        if INDICADORES[indicador][3] and extremos.any():
+            l, m, s, medida = (np.broadcast_to(v, z.shape)[extremos] for v in (l, m, s, medida))
+            de3_pos = _medida_en_z(l, m, s, 3.0)
+            de3_neg = _medida_en_z(l, m, s, -3.0)
+            z[extremos] = np.where(
+                medida > de3_pos,
+                3.0 + (medida - de3_pos) / (de3_pos - _medida_en_z(l, m, s, 2.0)),
+                -3.0 + (medida - de3_neg) / (_medida_en_z(l, m, s, -2.0) - de3_neg),
+            )
+    return z
+
+
+def medida_para_z(indicador, sexo, eje, z):
+    """
+    Valor de la medida que corresponde a un Z-score dado (curvas de crecimiento).
+    """
+    l, m, s = lms(indicador, sexo, eje)
+    return _medida_en_z(l, m, s, np.asarray(z, dtype=np.float64))
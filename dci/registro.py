@@ -0,0 +1,383 @@
+"""
+Registro longitudinal de mediciones (SQLite).
+
+Además del historial, el registro mantiene la tabla 'prevalencia' con conteos
+y sumas por banda de edad, sexo y comunidad, calculados sobre la última visita
+de cada niño. Se actualiza en la misma transacción que cada inserción, de modo
+que los tableros leen un resumen cuyo tamaño no depende del número de niños.
+
+Cada visita se guarda con su clave (niño, fecha) en una tabla WITHOUT ROWID,
+por lo que el historial de un niño es un recorrido contiguo del índice
+primario. La velocidad de crecimiento y el cambio de Z-score se calculan al
+insertar cada visita comparándola solo con la visita anterior y la siguiente
+del mismo niño, sin recalcular el historial completo.
+"""
+import datetime
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from dci import recursos, referencia
+from dci.clasificacion import banda_edad
+from dci.zscore import Z_CORTE_DCI
+
+RUTA_POR_DEFECTO = Path(os.environ.get("DCI_DATOS_DIR", Path.home() / ".local" / "share" / "dci")) / "registro.sqlite"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ninos (
+    id INTEGER PRIMARY KEY,
+    codigo TEXT NOT NULL UNIQUE,
+    nombre TEXT,
+    sexo INTEGER,
+    comunidad TEXT
+);
+CREATE TABLE IF NOT EXISTS visitas (
+    nino_id INTEGER NOT NULL REFERENCES ninos (id),
+    fecha TEXT NOT NULL,
+    edad_meses REAL NOT NULL,
+    peso_kg REAL,
+    estatura_cm REAL,
+    z_talla_edad REAL,
+    z_peso_edad REAL,
+    velocidad_talla REAL,
+    velocidad_peso REAL,
+    cambio_z_talla REAL,
+    PRIMARY KEY (nino_id, fecha)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ultima_visita (
+    nino_id INTEGER PRIMARY KEY REFERENCES ninos (id),
+    fecha TEXT NOT NULL,
+    banda_edad TEXT NOT NULL,
+    sexo INTEGER NOT NULL,
+    comunidad TEXT NOT NULL,
+    z_talla_edad REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prevalencia (
+    banda_edad TEXT NOT NULL,
+    sexo INTEGER NOT NULL,
+    comunidad TEXT NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    n_dci INTEGER NOT NULL DEFAULT 0,
+    n_dci_severa INTEGER NOT NULL DEFAULT 0,
+    suma_z REAL NOT NULL DEFAULT 0,
+    suma_z2 REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (banda_edad, sexo, comunidad)
+) WITHOUT ROWID;
+"""
+
+# Desnutrición crónica severa: talla para la edad por debajo de -3 DE
+Z_CORTE_DCI_SEVERA = -3.0
+
+SIN_COMUNIDAD = "(sin comunidad)"
+
+COLUMNAS_HISTORIAL = (
+    "fecha", "edad_meses", "peso_kg", "estatura_cm", "z_talla_edad", "z_peso_edad",
+    "velocidad_talla", "velocidad_peso", "cambio_z_talla",
+)
+
+
+def _nulo(valor):
+    return None if valor is None or valor != valor else float(valor)
+
+
+def _dias_entre(fecha_inicio, fecha_fin):
+    return (datetime.date.fromisoformat(fecha_fin) - datetime.date.fromisoformat(fecha_inicio)).days
+
+
+def _variaciones(anterior, actual):
+    """
+    Velocidades (por mes) y cambio de Z-score entre dos visitas consecutivas.
+    Cada visita es una tupla (fecha, peso_kg, estatura_cm, z_talla_edad).
+    """
+    if anterior is None:
+        return None, None, None
+    meses = _dias_entre(anterior[0], actual[0]) / referencia.DIAS_POR_MES
+    if meses <= 0:
+        return None, None, None
+
+    def por_mes(previo, nuevo):
+        return None if previo is None or nuevo is None else (nuevo - previo) / meses
+
+    cambio_z = None if anterior[3] is None or actual[3] is None else actual[3] - anterior[3]
+    return por_mes(anterior[2], actual[2]), por_mes(anterior[1], actual[1]), cambio_z
+
+
+class RegistroMediciones:
+    def __init__(self, ruta=RUTA_POR_DEFECTO):
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._candado = threading.Lock()
+        self._db = sqlite3.connect(str(ruta), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(ESQUEMA)
+        if self._db.execute("SELECT NOT EXISTS (SELECT 1 FROM ultima_visita)"
+                            " AND EXISTS (SELECT 1 FROM visitas)").fetchone()[0]:
+            self.reconstruir_prevalencia()
+
+    def _sumar_prevalencia(self, banda, sexo, comunidad, z, signo):
+        self._db.execute(
+            "INSERT INTO prevalencia (banda_edad, sexo, comunidad) VALUES (?, ?, ?) ON CONFLICT DO NOTHING",
+            (banda, sexo, comunidad),
+        )
+        self._db.execute(
+            "UPDATE prevalencia SET n = n + ?, n_dci = n_dci + ?, n_dci_severa = n_dci_severa + ?,"
+            " suma_z = suma_z + ?, suma_z2 = suma_z2 + ?"
+            " WHERE banda_edad = ? AND sexo = ? AND comunidad = ?",
+            (signo, signo * (z < Z_CORTE_DCI), signo * (z < Z_CORTE_DCI_SEVERA), signo * z, signo * z * z,
+             banda, sexo, comunidad),
+        )
+        if signo < 0:
+            # Un grupo que se queda sin niños no debe aparecer en los filtros
+            self._db.execute(
+                "DELETE FROM prevalencia WHERE banda_edad = ? AND sexo = ? AND comunidad = ? AND n = 0",
+                (banda, sexo, comunidad),
+            )
+
+    def _actualizar_prevalencia(self, nino_id, fecha, edad_meses, sexo, comunidad, z_talla):
+        """
+        Reemplaza la contribución del niño a la tabla de prevalencia por la de
+        su visita más reciente. Solo toca dos filas del resumen.
+        """
+        previa = self._db.execute(
+            "SELECT banda_edad, sexo, comunidad, z_talla_edad FROM ultima_visita WHERE nino_id = ?", (nino_id,)
+        ).fetchone()
+        if previa is not None:
+            self._sumar_prevalencia(*previa, signo=-1)
+            self._db.execute("DELETE FROM ultima_visita WHERE nino_id = ?", (nino_id,))
+        if sexo is None or z_talla is None:
+            return
+        fila = (banda_edad(edad_meses), sexo, comunidad or SIN_COMUNIDAD, z_talla)
+        self._sumar_prevalencia(*fila, signo=1)
+        self._db.execute("INSERT INTO ultima_visita VALUES (?, ?, ?, ?, ?, ?)", (nino_id, fecha, *fila))
+
+    def reconstruir_prevalencia(self):
+        """
+        Recalcula la tabla de prevalencia desde cero (solo para migrar datos
+        existentes; las inserciones normales la actualizan de forma incremental).
+        """
+        with self._db:
+            self._db.execute("DELETE FROM prevalencia")
+            self._db.execute("DELETE FROM ultima_visita")
+            ultimas = self._db.execute(
+                "SELECT v.nino_id, v.fecha, v.edad_meses, n.sexo, n.comunidad, v.z_talla_edad"
+                " FROM visitas v JOIN ninos n ON n.id = v.nino_id"
+                " WHERE v.fecha = (SELECT max(fecha) FROM visitas WHERE nino_id = v.nino_id)"
+            ).fetchall()
+            for fila in ultimas:
+                self._actualizar_prevalencia(*fila)
+
+    def _id_nino(self, codigo, nombre, sexo, comunidad):
+        """
+        Crea o actualiza el niño. Devuelve (id, sexo, comunidad, sexo_cambio,
+        comunidad_cambio); los cambios solo cuentan para niños ya registrados.
+        """
+        previo = self._db.execute("SELECT sexo, comunidad FROM ninos WHERE codigo = ?", (codigo,)).fetchone()
+        self._db.execute(
+            "INSERT INTO ninos (codigo, nombre, sexo, comunidad) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (codigo) DO UPDATE SET"
+            " nombre = coalesce(excluded.nombre, nombre),"
+            " sexo = coalesce(excluded.sexo, sexo),"
+            " comunidad = coalesce(excluded.comunidad, comunidad)",
+            (codigo, nombre, sexo, comunidad),
+        )
+        nino_id, sexo, comunidad = self._db.execute(
+            "SELECT id, sexo, comunidad FROM ninos WHERE codigo = ?", (codigo,)
+        ).fetchone()
+        if previo is None:
+            return nino_id, sexo, comunidad, False, False
+        return nino_id, sexo, comunidad, previo[0] != sexo, previo[1] != comunidad
+
+    def _recalcular_zscores(self, nino_id, sexo):
+        """
+        Recalcula los Z-scores y las variaciones de todas las visitas de un
+        niño (solo hace falta cuando cambia su sexo).
+        """
+        filas = self._db.execute(
+            "SELECT fecha, edad_meses, peso_kg, estatura_cm FROM visitas WHERE nino_id = ? ORDER BY fecha",
+            (nino_id,),
+        ).fetchall()
+        sexos = np.full(len(filas), -1 if sexo is None else sexo)
+        dias = np.array([f[1] for f in filas], dtype=np.float64) * referencia.DIAS_POR_MES
+        pesos = np.array([np.nan if f[2] is None else f[2] for f in filas], dtype=np.float64)
+        tallas = np.array([np.nan if f[3] is None else f[3] for f in filas], dtype=np.float64)
+        z_talla = referencia.zscore("talla_edad", sexos, dias, tallas)
+        z_peso = referencia.zscore("peso_edad", sexos, dias, pesos)
+
+        anterior = None
+        for i, (fecha, _, peso, talla) in enumerate(filas):
+            actual = (fecha, peso, talla, _nulo(z_talla[i]))
+            self._db.execute(
+                "UPDATE visitas SET z_talla_edad = ?, z_peso_edad = ?,"
+                " velocidad_talla = ?, velocidad_peso = ?, cambio_z_talla = ? WHERE nino_id = ? AND fecha = ?",
+                (actual[3], _nulo(z_peso[i]), *_variaciones(anterior, actual), nino_id, fecha),
+            )
+            anterior = actual
+
+    def _refrescar_ultima_visita(self, nino_id, sexo, comunidad):
+        """
+        Vuelve a calcular la contribución del niño a la prevalencia desde su
+        visita más reciente, por ejemplo tras cambiar su sexo o comunidad.
+        """
+        ultima = self._db.execute(
+            "SELECT fecha, edad_meses, z_talla_edad FROM visitas WHERE nino_id = ? ORDER BY fecha DESC LIMIT 1",
+            (nino_id,),
+        ).fetchone()
+        if ultima is not None:
+            self._actualizar_prevalencia(nino_id, ultima[0], ultima[1], sexo, comunidad, ultima[2])
+
+    def registrar_visitas(self, visitas):
+        """
+        Guarda un lote de visitas en una sola transacción.
+
+        Cada visita es un diccionario con 'codigo', 'fecha' (date o texto ISO),
+        'edad_meses', 'peso_kg', 'estatura_cm' y, opcionalmente, 'nombre',
+        'sexo' y 'comunidad'. Una visita con la misma fecha reemplaza a la
+        anterior. Devuelve el número de visitas guardadas.
+        """
+        visitas = sorted(visitas, key=lambda v: (v["codigo"], str(v["fecha"])))
+        if not visitas:
+            return 0
+
+        with self._candado, self._db:
+            ninos = {}
+            for visita in visitas:
+                codigo = visita["codigo"]
+                if codigo not in ninos:
+                    sexo = visita.get("sexo")
+                    sexo = None if sexo is None else int(referencia.codificar_sexo([sexo])[0])
+                    ninos[codigo] = self._id_nino(codigo, visita.get("nombre"), None if sexo == -1 else sexo,
+                                                  visita.get("comunidad"))
+
+            # Z-scores de todo el lote en una sola pasada vectorizada
+            sexos = np.array([-1 if ninos[v["codigo"]][1] is None else ninos[v["codigo"]][1] for v in visitas])
+            dias = np.array([v["edad_meses"] for v in visitas], dtype=np.float64) * referencia.DIAS_POR_MES
+            pesos = np.array([np.nan if v.get("peso_kg") is None else v["peso_kg"] for v in visitas], dtype=np.float64)
+            tallas = np.array([np.nan if v.get("estatura_cm") is None else v["estatura_cm"] for v in visitas], dtype=np.float64)
+            z_talla = referencia.zscore("talla_edad", sexos, dias, tallas)
+            z_peso = referencia.zscore("peso_edad", sexos, dias, pesos)
+
+            for i, visita in enumerate(visitas):
+                nino_id = ninos[visita["codigo"]][0]
+                fecha = str(visita["fecha"])
+                actual = (fecha, _nulo(pesos[i]), _nulo(tallas[i]), _nulo(z_talla[i]))
+                anterior = self._db.execute(
+                    "SELECT fecha, peso_kg, estatura_cm, z_talla_edad FROM visitas"
+                    " WHERE nino_id = ? AND fecha < ? ORDER BY fecha DESC LIMIT 1",
+                    (nino_id, fecha),
+                ).fetchone()
+                velocidad_talla, velocidad_peso, cambio_z = _variaciones(anterior, actual)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO visitas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (nino_id, fecha, float(visita["edad_meses"]), actual[1], actual[2], actual[3],
+                     _nulo(z_peso[i]), velocidad_talla, velocidad_peso, cambio_z),
+                )
+
+                # Si la visita se insertó entre dos existentes, solo cambia la siguiente
+                siguiente = self._db.execute(
+                    "SELECT fecha, peso_kg, estatura_cm, z_talla_edad FROM visitas"
+                    " WHERE nino_id = ? AND fecha > ? ORDER BY fecha LIMIT 1",
+                    (nino_id, fecha),
+                ).fetchone()
+                if siguiente is not None:
+                    self._db.execute(
+                        "UPDATE visitas SET velocidad_talla = ?, velocidad_peso = ?, cambio_z_talla = ?"
+                        " WHERE nino_id = ? AND fecha = ?",
+                        (*_variaciones(actual, siguiente), nino_id, siguiente[0]),
+                    )
+                else:
+                    _, sexo, comunidad, _, _ = ninos[visita["codigo"]]
+                    self._actualizar_prevalencia(nino_id, fecha, visita["edad_meses"], sexo, comunidad, actual[3])
+
+            # Una visita atrasada también puede cambiar el sexo o la comunidad del niño
+            for nino_id, sexo, comunidad, sexo_cambio, comunidad_cambio in ninos.values():
+                if sexo_cambio:
+                    self._recalcular_zscores(nino_id, sexo)
+                if sexo_cambio or comunidad_cambio:
+                    self._refrescar_ultima_visita(nino_id, sexo, comunidad)
+        return len(visitas)
+
+    def registrar_visita(self, codigo, fecha, edad_meses, peso_kg, estatura_cm, nombre=None, sexo=None, comunidad=None):
+        """
+        Atajo para guardar una sola visita.
+        """
+        return self.registrar_visitas([{
+            "codigo": codigo, "fecha": fecha, "edad_meses": edad_meses, "peso_kg": peso_kg,
+            "estatura_cm": estatura_cm, "nombre": nombre, "sexo": sexo, "comunidad": comunidad,
+        }])
+
+    def historial(self, codigo):
+        """
+        Visitas de un niño ordenadas por fecha, como lista de diccionarios.
+        """
+        with self._candado:
+            filas = self._db.execute(
+                "SELECT v.fecha, v.edad_meses, v.peso_kg, v.estatura_cm, v.z_talla_edad, v.z_peso_edad,"
+                " v.velocidad_talla, v.velocidad_peso, v.cambio_z_talla"
+                " FROM visitas v JOIN ninos n ON n.id = v.nino_id WHERE n.codigo = ? ORDER BY v.fecha",
+                (codigo,),
+            ).fetchall()
+        return [dict(zip(COLUMNAS_HISTORIAL, fila)) for fila in filas]
+
+    def prevalencia(self, por=("banda_edad", "sexo", "comunidad"), comunidad=None, sexo=None):
+        """
+        Prevalencia de DCI agrupada por las columnas indicadas en 'por'
+        (subconjunto de banda_edad, sexo y comunidad), leída del resumen
+        precalculado. Devuelve una lista de diccionarios con n, n_dci,
+        n_dci_severa, prevalencia, prevalencia_severa, z_media y z_de.
+        """
+        por = tuple(c for c in ("banda_edad", "sexo", "comunidad") if c in por)
+        condiciones, parametros = [], []
+        if comunidad is not None:
+            condiciones.append("comunidad = ?")
+            parametros.append(comunidad)
+        if sexo is not None:
+            condiciones.append("sexo = ?")
+            parametros.append(sexo)
+        consulta = (
+            f"SELECT {''.join(c + ', ' for c in por)}"
+            "sum(n), sum(n_dci), sum(n_dci_severa), sum(suma_z), sum(suma_z2) FROM prevalencia"
+            + (" WHERE " + " AND ".join(condiciones) if condiciones else "")
+            + (f" GROUP BY {', '.join(por)}" if por else "")
+        )
+        with self._candado:
+            filas = self._db.execute(consulta, parametros).fetchall()
+
+        resultado = []
+        for fila in filas:
+            grupo = dict(zip(por, fila[:len(por)]))
+            n, n_dci, n_severa, suma_z, suma_z2 = fila[len(por):]
+            if not n:
+                continue
+            media = suma_z / n
+            grupo.update(
+                n=n, n_dci=n_dci, n_dci_severa=n_severa,
+                prevalencia=n_dci / n, prevalencia_severa=n_severa / n,
+                z_media=media, z_de=max(suma_z2 / n - media * media, 0.0) ** 0.5,
+            )
+            resultado.append(grupo)
+
+        def orden(grupo):
+            # Las bandas se ordenan por su edad inicial, no como texto
+            return tuple(int(grupo[c].split("-")[0]) if c == "banda_edad" else grupo[c] for c in por)
+
+        return sorted(resultado, key=orden)
+
+    def comunidades(self):
+        with self._candado:
+            return [c for (c,) in self._db.execute("SELECT DISTINCT comunidad FROM prevalencia ORDER BY comunidad")]
+
+    def contar_visitas(self):
+        with self._candado:
+            return self._db.execute("SELECT COUNT(*) FROM visitas").fetchone()[0]
+
+
+def registro_compartido():
+    """
+    Registro único del proceso, compartido por todas las páginas y sesiones
+    (dci.recursos).
+    """
+    return recursos.obtener("registro_mediciones")
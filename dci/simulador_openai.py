@@ -0,0 +1,122 @@
+"""
+Servidor HTTP local que imita el endpoint /v1/chat/completions.
+
+Sirve para probar el cliente de recomendaciones y medir la aplicación sin
+llamar a la API real:
+
+    python -m dci.simulador_openai --puerto 8765 --retardo 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run proyecto.py
+
+Con --fallos N las primeras N solicitudes responden 503 (o el estado de
+--estado-fallo) para ejercitar los reintentos.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESPUESTA = (
+    "**Guía de alimentación (simulada):** ofrecer 5 comidas al día con huevo, "
+    "chochos, quinua, leche y verduras de la zona; añadir una cucharadita de aceite "
+    "a las sopas y papillas; y continuar con la lactancia materna."
+)
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionError:
+            # El cliente cerró o descartó la conexión (tras un streaming, al
+            # vencer su tiempo límite o antes de leer la respuesta completa)
+            pass
+
+    def do_POST(self):
+        servidor = self.server
+        cuerpo = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with servidor.candado:
+            servidor.solicitudes += 1
+            fallar = servidor.solicitudes <= servidor.fallos
+
+        if not self.path.endswith("/chat/completions") or fallar:
+            estado = 404 if not fallar else servidor.estado_fallo
+            contenido = json.dumps({"error": {"message": "no disponible"}}).encode()
+            self.send_response(estado)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(contenido)))
+            self.end_headers()
+            self.wfile.write(contenido)
+            return
+
+        palabras = servidor.respuesta.split(" ")
+        if not cuerpo.get("stream"):
+            time.sleep(servidor.retardo * len(palabras))
+            contenido = json.dumps({
+                "object": "chat.completion",
+                "model": cuerpo.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": servidor.respuesta},
+                             "finish_reason": "stop"}],
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(contenido)))
+            self.end_headers()
+            self.wfile.write(contenido)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i, palabra in enumerate(palabras):
+                time.sleep(servidor.retardo)
+                fragmento = {"choices": [{"index": 0, "delta": {"content": palabra if i == 0 else " " + palabra}}]}
+                self._enviar_bloque(f"data: {json.dumps(fragmento)}\n\n".encode())
+            self._enviar_bloque(b"data: [DONE]\n\n")
+            self._enviar_bloque(b"")
+        except ConnectionError:
+            # El cliente cerró la conexión al leer [DONE] o al vencer su tiempo límite
+            self.close_connection = True
+
+    def _enviar_bloque(self, datos):
+        self.wfile.write(f"{len(datos):X}\r\n".encode() + datos + b"\r\n")
+        self.wfile.flush()
+
+
+def iniciar(puerto=0, retardo=0.0, fallos=0, respuesta=RESPUESTA, estado_fallo=503):
+    """
+    Inicia el servidor en un hilo de fondo y lo devuelve. La URL base para el
+    cliente es f"http://127.0.0.1:{servidor.server_port}/v1".
+    """
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), _Manejador)
+    servidor.daemon_threads = True
+    servidor.retardo = retardo
+    servidor.fallos = fallos
+    servidor.estado_fallo = estado_fallo
+    servidor.respuesta = respuesta
+    servidor.solicitudes = 0
+    servidor.candado = threading.Lock()
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--retardo", type=float, default=0.05, help="segundos entre fragmentos")
+    parser.add_argument("--fallos", type=int, default=0, help="primeras solicitudes que responden con error")
+    parser.add_argument("--estado-fallo", type=int, default=503, help="código HTTP de esas respuestas (p. ej. 429)")
+    args = parser.parse_args()
+    servidor = iniciar(args.puerto, args.retardo, args.fallos, estado_fallo=args.estado_fallo)
+    print(f"Simulador escuchando en http://127.0.0.1:{servidor.server_port}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
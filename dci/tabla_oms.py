@@ -0,0 +1,41 @@
+"""
+Tabla simplificada de talla para la edad de la OMS (niños de 0 a 60 meses)
+usada por classify_dci. Los datos viven en arreglos de NumPy; pandas solo se
+importa si se pide la tabla como DataFrame.
+"""
+import numpy as np
+
+from dci import recursos
+
+TABLA_TALLA_EDAD = {
+    'age_months': np.arange(0, 61),
+    'mediana_z0': np.array([
+        49.9, 54.7, 58.4, 61.4, 63.9, 66.0, 67.8, 69.2, 70.6, 71.9, 73.1, 74.5, 75.7, 76.9, 78.0, 79.1, 80.1, 81.1, 82.0, 82.9,
+        83.8, 84.7, 85.5, 86.4, 87.2, 88.0, 88.8, 89.5, 90.3, 91.0, 91.7, 92.4, 93.0, 93.7, 94.3, 94.9, 95.5, 96.1, 96.7, 97.2,
+        97.8, 98.4, 98.9, 99.5, 100.0, 100.6, 101.1, 101.7, 102.2, 102.8, 103.3, 103.8, 104.3, 104.8, 105.3, 105.8, 106.3, 106.8,
+        107.3, 107.8, 108.3
+    ]),
+    'desviacion_estandar': np.array([
+        1.8, 2.1, 2.3, 2.4, 2.5, 2.5, 2.6, 2.6, 2.6, 2.6, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7,
+        2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7,
+        2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7,
+        2.7
+    ]),
+}
+
+
+def construir_who_df():
+    """
+    Construye la tabla de talla para la edad como DataFrame de pandas.
+    """
+    import pandas as pd
+
+    return pd.DataFrame({columna: valores.copy() for columna, valores in TABLA_TALLA_EDAD.items()})
+
+
+def get_who_data():
+    """
+    Devuelve la tabla de talla para la edad como DataFrame de pandas. La misma
+    instancia se comparte entre sesiones (ver dci.recursos): no modificarla.
+    """
+    return recursos.obtener("tabla_oms")
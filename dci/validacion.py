@@ -0,0 +1,235 @@
+"""
+Validación por lotes antes de clasificar.
+
+Marca en una sola pasada sobre arreglos completos los valores biológicamente
+implausibles según los límites de la OMS, las edades fuera de 0-60 meses
+enteros, las confusiones de unidades más comunes en datos de campo (talla en
+mm, edad en años, peso y talla intercambiados) y las visitas duplicadas. Cada fila recibe una máscara de
+bits con sus motivos; las filas marcadas se separan en cuarentena en lugar de
+detener el lote.
+
+El Z-score de talla para la edad usa la misma referencia que classify_dci
+(dci.zscore); peso para la edad, peso para la talla e IMC para la edad usan
+las tablas LMS de dci.referencia cuando hay peso y sexo, y solo se calculan
+para las filas que no tienen ya otro motivo.
+"""
+import numpy as np
+
+from dci import referencia
+from dci.zscore import classify_dci_batch
+
+FALTANTE = 1
+TALLA_EN_MM = 2
+EDAD_EN_ANIOS = 4
+PESO_TALLA_INTERCAMBIADOS = 8
+HAZ_IMPLAUSIBLE = 16
+WAZ_IMPLAUSIBLE = 32
+WHZ_IMPLAUSIBLE = 64
+BAZ_IMPLAUSIBLE = 128
+VISITA_DUPLICADA = 256
+EDAD_IMPLAUSIBLE = 512
+
+MOTIVOS = {
+    FALTANTE: "edad o talla faltante",
+    TALLA_EN_MM: "talla en mm",
+    EDAD_EN_ANIOS: "edad en años",
+    PESO_TALLA_INTERCAMBIADOS: "peso y talla intercambiados",
+    HAZ_IMPLAUSIBLE: "talla/edad implausible",
+    WAZ_IMPLAUSIBLE: "peso/edad implausible",
+    WHZ_IMPLAUSIBLE: "peso/talla implausible",
+    BAZ_IMPLAUSIBLE: "IMC/edad implausible",
+    VISITA_DUPLICADA: "visita duplicada",
+    EDAD_IMPLAUSIBLE: "edad fuera de 0-60 meses enteros",
+}
+
+# Límites de la OMS para Z-scores biológicamente implausibles (mínimo, máximo)
+LIMITES_BIV = {
+    "haz": (-6.0, 6.0),
+    "waz": (-6.0, 5.0),
+    "whz": (-5.0, 5.0),
+    "baz": (-5.0, 5.0),
+}
+
+# Ningún menor de 5 años mide más de esto; por encima, la talla está en mm
+TALLA_MAXIMA_CM = 200.0
+# Edad máxima de los patrones de la OMS; las edades se registran en meses enteros
+EDAD_MAXIMA_MESES = 60
+# Desde esta edad se usa peso para la talla (de pie) en lugar de peso para la longitud
+MESES_PESO_TALLA = 24
+
+
+def _fuera(z, indicador):
+    minimo, maximo = LIMITES_BIV[indicador]
+    return (z < minimo) | (z > maximo)
+
+
+def validar_arrays(age_months, height_cm, weight_kg=None, sexo=None):
+    """
+    Devuelve la máscara de motivos (uint16) de cada fila. El intercambio de
+    peso y talla necesita weight_kg, y los Z-scores de peso además el sexo
+    (ver referencia.codificar_sexo).
+    """
+    edades = np.asarray(age_months, dtype=np.float64)
+    tallas = np.asarray(height_cm, dtype=np.float64)
+    banderas = np.zeros(edades.shape, dtype=np.uint16)
+    banderas[np.isnan(edades) | np.isnan(tallas)] |= FALTANTE
+
+    banderas[tallas > TALLA_MAXIMA_CM] |= TALLA_EN_MM
+    # Una edad faltante ya cuenta como FALTANTE, no como edad implausible
+    edad_implausible = ~np.isnan(edades) & ((edades < 0) | (edades > EDAD_MAXIMA_MESES) | (edades != np.floor(edades)))
+    banderas[edad_implausible] |= EDAD_IMPLAUSIBLE
+
+    haz, _ = classify_dci_batch(edades, tallas)
+    biv_haz = _fuera(haz, "haz")
+    banderas[biv_haz] |= HAZ_IMPLAUSIBLE
+
+    # Talla imposible (o edad no entera) en meses pero normal si la edad estaba en años
+    candidatas = np.flatnonzero((biv_haz | edad_implausible) & (edades >= 0) & (edades <= 5))
+    if candidatas.size:
+        haz_anios, _ = classify_dci_batch(edades[candidatas] * 12, tallas[candidatas])
+        banderas[candidatas[np.abs(haz_anios) <= 3]] |= EDAD_EN_ANIOS
+
+    if weight_kg is None:
+        return banderas
+    pesos = np.asarray(weight_kg, dtype=np.float64)
+    banderas[pesos > tallas] |= PESO_TALLA_INTERCAMBIADOS
+
+    if sexo is None:
+        return banderas
+    sexos = referencia.codificar_sexo(sexo)
+
+    # Los Z-scores LMS solo cambian el resultado de las filas aún sin motivo
+    pendientes = np.flatnonzero((banderas == 0) & (sexos >= 0) & ~np.isnan(pesos))
+    if not pendientes.size:
+        return banderas
+    edades, tallas, pesos, sexos = edades[pendientes], tallas[pendientes], pesos[pendientes], sexos[pendientes]
+    dias = np.round(edades * referencia.DIAS_POR_MES)
+    with np.errstate(invalid="ignore"):
+        waz = referencia.zscore("peso_edad", sexos, dias, pesos)
+        whz = np.full(edades.shape, np.nan)
+        longitud = edades < MESES_PESO_TALLA
+        talla = edades >= MESES_PESO_TALLA
+        whz[longitud] = referencia.zscore("peso_longitud", sexos[longitud], tallas[longitud], pesos[longitud])
+        whz[talla] = referencia.zscore("peso_talla", sexos[talla], tallas[talla], pesos[talla])
+        baz = referencia.zscore("imc_edad", sexos, dias, pesos / (tallas / 100.0) ** 2)
+    banderas[pendientes[_fuera(waz, "waz")]] |= WAZ_IMPLAUSIBLE
+    banderas[pendientes[_fuera(whz, "whz")]] |= WHZ_IMPLAUSIBLE
+    banderas[pendientes[_fuera(baz, "baz")]] |= BAZ_IMPLAUSIBLE
+    return banderas
+
+
+def claves_visita(columnas):
+    """
+    Clave hash (uint64) de cada visita a partir de sus columnas de
+    identificación. Los valores se comparan como texto, de modo que el mismo
+    código da la misma clave aunque pandas lo lea como número en un bloque y
+    como texto en otro.
+    """
+    import pandas as pd
+
+    return pd.util.hash_pandas_object(columnas.astype(str), index=False).to_numpy()
+
+
+def describir(banderas):
+    """
+    Texto con los motivos de cada fila, separados por "; " ("" si no tiene).
+    """
+    banderas = np.asarray(banderas)
+    textos = np.full(banderas.shape, "", dtype=object)
+    for bit, motivo in MOTIVOS.items():
+        marcadas = (banderas & bit) != 0
+        textos[marcadas] = np.where(textos[marcadas] == "", motivo, textos[marcadas] + "; " + motivo)
+    return textos
+
+
+def contar_motivos(banderas):
+    """
+    Cantidad de filas por motivo (una fila puede tener varios).
+    """
+    banderas = np.asarray(banderas)
+    return {motivo: int(np.count_nonzero(banderas & bit)) for bit, motivo in MOTIVOS.items()}
+
+
+class Validador:
+    """
+    Valida DataFrames por bloques y acumula el reporte. Recuerda las visitas
+    válidas ya vistas (en un conjunto de claves hash) para detectar
+    duplicados entre bloques del mismo archivo. Después de cada validar(),
+    claves_validas tiene las claves de las filas válidas, en orden (None sin
+    columnas de visita).
+    """
+
+    def __init__(self, col_edad, col_estatura, col_peso=None, col_sexo=None, col_id=None, col_fecha=None):
+        self.col_edad = col_edad
+        self.col_estatura = col_estatura
+        self.col_peso = col_peso
+        self.col_sexo = col_sexo
+        # Una visita es (niño, fecha); sin fecha se usa la edad
+        self.cols_visita = [col_id, col_fecha or col_edad] if col_id else []
+        self._vistas = set()
+        self.claves_validas = None
+        self.filas = 0
+        self.motivos = dict.fromkeys(MOTIVOS.values(), 0)
+        self.cuarentena = 0
+
+    def validar(self, bloque):
+        """
+        Devuelve (validas, cuarentena): dos DataFrames; el segundo lleva una
+        columna 'motivos'. En las válidas las columnas de medidas se
+        convierten a número; la cuarentena conserva los valores originales
+        para que se vea qué hay que corregir.
+        """
+        import pandas as pd
+
+        original = bloque
+        numericas = {
+            col: pd.to_numeric(bloque[col], errors="coerce")
+            for col in (self.col_edad, self.col_estatura, self.col_peso)
+            if col is not None
+        }
+        bloque = bloque.assign(**numericas)
+        sexos = None
+        if self.col_sexo:
+            # Se codifican solo los valores distintos, no cada fila
+            indices, distintos = pd.factorize(bloque[self.col_sexo])
+            sexos = np.where(indices >= 0, referencia.codificar_sexo(distintos.to_numpy())[indices], -1)
+        banderas = validar_arrays(
+            bloque[self.col_edad].to_numpy(),
+            bloque[self.col_estatura].to_numpy(),
+            bloque[self.col_peso].to_numpy() if self.col_peso else None,
+            sexos,
+        )
+
+        claves = None
+        if self.cols_visita:
+            # Solo cuentan como ya vistas las visitas válidas: una copia de una
+            # fila en cuarentena por otro motivo no es un duplicado. Es la misma
+            # regla que aplica la CLI entre partes con claves_validas.
+            claves = claves_visita(bloque[self.cols_visita])
+            candidatas = np.flatnonzero(banderas == 0)
+            propias = claves[candidatas]
+            repetidas = pd.Series(propias).duplicated().to_numpy()
+            if self._vistas:
+                vistas = self._vistas
+                repetidas = repetidas | np.fromiter((clave in vistas for clave in propias.tolist()), dtype=bool, count=len(propias))
+            banderas[candidatas[repetidas]] |= VISITA_DUPLICADA
+            self._vistas.update(propias[~repetidas].tolist())
+
+        marcadas = banderas != 0
+        self.claves_validas = None if claves is None else claves[~marcadas]
+        self.filas += len(bloque)
+        self.cuarentena += int(np.count_nonzero(marcadas))
+        for motivo, cantidad in contar_motivos(banderas).items():
+            self.motivos[motivo] += cantidad
+        return bloque[~marcadas], original[marcadas].assign(motivos=describir(banderas[marcadas]))
+
+    def reporte(self):
+        """
+        Resumen acumulado: filas revisadas, válidas, en cuarentena y por motivo.
+        """
+        return {
+            "filas": self.filas,
+            "validas": self.filas - self.cuarentena,
+            "cuarentena": self.cuarentena,
+            "motivos": dict(self.motivos),
+        }
@@ -0,0 +1,82 @@
+"""
+Clasificación vectorizada de la talla para la edad (Z-score de la OMS).
+
+En lugar de filtrar la tabla de referencia por cada niño, se construye un
+arreglo indexado por la edad en meses y se calcula el Z-score de toda la
+cohorte en una sola pasada de NumPy.
+"""
+import numpy as np
+
+from dci import recursos
+
+# Umbral de la OMS: talla para la edad por debajo de -2 DE indica DCI
+Z_CORTE_DCI = -2.0
+
+# Códigos de estado devueltos por la clasificación por lotes
+CODIGO_FUERA_RANGO = -1
+CODIGO_NORMAL = 0
+CODIGO_RIESGO = 1
+
+ESTADOS_DCI = {
+    CODIGO_FUERA_RANGO: "Edad fuera del rango de referencia",
+    CODIGO_NORMAL: "Normal",
+    CODIGO_RIESGO: "Riesgo de Desnutrición Crónica",
+}
+
+
+def who_lookup_arrays(who_df=None):
+    """
+    Convierte la tabla de la OMS (columnas 'age_months', 'mediana_z0' y
+    'desviacion_estandar') en dos arreglos indexados directamente por la edad.
+    Las edades que no aparecen en la tabla quedan como NaN. Sin argumento se
+    usa TABLA_TALLA_EDAD, cuyos arreglos se comparten en dci.recursos.
+    """
+    if who_df is None:
+        return recursos.obtener("talla_edad")
+
+    edades = np.asarray(who_df["age_months"], dtype=np.int64)
+    mediana = np.full(edades.max() + 1, np.nan)
+    desviacion = np.full(edades.max() + 1, np.nan)
+    mediana[edades] = np.asarray(who_df["mediana_z0"], dtype=np.float64)
+    desviacion[edades] = np.asarray(who_df["desviacion_estandar"], dtype=np.float64)
+    return mediana, desviacion
+
+
+def classify_dci_batch(age_months, height_cm, who_df=None):
+    """
+    Calcula el Z-score de talla para la edad y el código de estado de muchos
+    niños a la vez.
+
+    Devuelve una tupla (z_scores, codigos). Los niños con una edad fuera de la
+    tabla de referencia reciben Z-score NaN y el código CODIGO_FUERA_RANGO.
+    Si no se indica who_df se usa la tabla de dci.tabla_oms.
+    """
+    mediana, desviacion = who_lookup_arrays(who_df)
+    edades = np.asarray(age_months)
+    tallas = np.asarray(height_cm, dtype=np.float64)
+
+    en_rango = (edades >= 0) & (edades < len(mediana)) & (edades == np.floor(edades))
+    indices = np.where(en_rango, edades, 0).astype(np.int64)
+
+    z_scores = (tallas - mediana[indices]) / desviacion[indices]
+    z_scores[~en_rango] = np.nan
+
+    codigos = np.where(z_scores < Z_CORTE_DCI, CODIGO_RIESGO, CODIGO_NORMAL).astype(np.int8)
+    codigos[np.isnan(z_scores)] = CODIGO_FUERA_RANGO
+    return z_scores, codigos
+
+
+def classify_dci_df(children_df, who_df=None, age_col="age_months", height_col="height_cm"):
+    """
+    Variante de classify_dci_batch para un DataFrame de niños. Devuelve una
+    copia con las columnas 'z_score', 'dci_codigo' y 'dci_status' añadidas.
+    """
+    z_scores, codigos = classify_dci_batch(
+        children_df[age_col].to_numpy(), children_df[height_col].to_numpy(), who_df
+    )
+    etiquetas = np.array([ESTADOS_DCI[c] for c in (CODIGO_FUERA_RANGO, CODIGO_NORMAL, CODIGO_RIESGO)])
+    return children_df.assign(
+        z_score=z_scores,
+        dci_codigo=codigos,
+        dci_status=etiquetas[codigos + 1],
+    )
@@ -0,0 +1,74 @@
+import streamlit as st
+
+from dci import Z_CORTE_DCI, metricas
+from dci.referencia import SEXO_FEMENINO, SEXO_MASCULINO
+from dci.registro import Z_CORTE_DCI_SEVERA, registro_compartido
+
+NOMBRES_SEXO = {SEXO_FEMENINO: "Femenino", SEXO_MASCULINO: "Masculino"}
+
+# Perfilado del rerun y recursos compartidos
+metricas.iniciar_pagina("pages/prevalencia.py")
+
+# sección de encabezado del tablero
+st.title("Prevalencia de Desnutrición Crónica Infantil")
+st.text(
+    f"Última visita de cada menor registrado. DCI: talla para la edad < {Z_CORTE_DCI:g} DE; "
+    f"DCI severa: < {Z_CORTE_DCI_SEVERA:g} DE (patrones de la OMS)."
+)
+
+# Los datos se leen de la tabla de resumen, que se actualiza al guardar cada visita
+registro = registro_compartido()
+with metricas.span("prevalencia"):
+    total = registro.prevalencia(por=())
+if not total:
+    # La página aparece en las tres apps, pero solo streamlit_app.py registra visitas
+    st.info(
+        "Todavía no hay visitas registradas. Las visitas se guardan con el botón \"Guardar datos\" "
+        "de la app de seguimiento (streamlit run streamlit_app.py) y se muestran aquí desde cualquier app."
+    )
+    st.stop()
+
+# sección de filtros
+seccionFiltros = st.container(border=True)
+with seccionFiltros:
+    col1, col2 = st.columns(2)
+    comunidad = col1.selectbox("Comunidad", ["Todas"] + registro.comunidades())
+    sexo = col2.selectbox("Sexo", ["Ambos", "Femenino", "Masculino"])
+
+filtro_comunidad = None if comunidad == "Todas" else comunidad
+filtro_sexo = {"Femenino": SEXO_FEMENINO, "Masculino": SEXO_MASCULINO}.get(sexo)
+
+# sección de indicadores generales
+resumen = registro.prevalencia(por=(), comunidad=filtro_comunidad, sexo=filtro_sexo)
+if not resumen:
+    st.warning("No hay visitas para el filtro seleccionado.")
+    st.stop()
+resumen = resumen[0]
+col1, col2, col3 = st.columns(3)
+col1.metric("Menores evaluados", f"{resumen['n']:,}")
+col2.metric("Prevalencia de DCI", f"{resumen['prevalencia']:.1%}")
+col3.metric("Prevalencia de DCI severa", f"{resumen['prevalencia_severa']:.1%}")
+
+# sección por banda de edad
+st.header("Por banda de edad (meses)")
+por_banda = registro.prevalencia(por=("banda_edad",), comunidad=filtro_comunidad, sexo=filtro_sexo)
+st.bar_chart(por_banda, x="banda_edad", y="prevalencia", x_label="Edad (meses)", y_label="Prevalencia de DCI")
+
+# sección por sexo y comunidad
+st.header("Por sexo y comunidad")
+detalle = registro.prevalencia(por=("sexo", "comunidad"), comunidad=filtro_comunidad, sexo=filtro_sexo)
+for fila in detalle:
+    fila["sexo"] = NOMBRES_SEXO.get(fila["sexo"], fila["sexo"])
+st.dataframe(
+    detalle,
+    hide_index=True,
+    column_order=("comunidad", "sexo", "n", "n_dci", "prevalencia", "n_dci_severa", "prevalencia_severa", "z_media"),
+    column_config={
+        "prevalencia": st.column_config.NumberColumn("Prevalencia DCI", format="percent"),
+        "prevalencia_severa": st.column_config.NumberColumn("Prevalencia DCI severa", format="percent"),
+        "z_media": st.column_config.NumberColumn("Z-score medio", format="%.2f"),
+    },
+)
+
+# --- Panel de perfilado ---
+metricas.mostrar_panel()
@@ -3,82 +3,106 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import requests
-#import os
+import functools
+import os
+import tempfile
+
+from dci import classify_dci_aproximado, get_who_data, metricas
+from dci.cache import cache_compartida, clave_perfil
+from dci.cliente_openai import ClienteRecomendaciones, construir_mensajes
+from dci.cohorte import iter_bloques, screen_cohort
+from dci.graficos import figura_talla_edad
+from dci.historial import mostrar_historial
+from dci.recomendaciones import PRESUPUESTO_SEGUNDOS, Transmision, en_segundo_plano, esperar, guia_local
+
+# Tiempo que se espera a la caché antes de mostrar la guía precalculada
+ESPERA_CACHE = 0.05
 
 # Set page configuration
 st.set_page_config(page_title="Diagnóstico de Desnutrición Crónica Infantil", layout="wide")
 
+# Perfilado del rerun y recursos compartidos
+metricas.iniciar_pagina("proyecto.py")
 
+presupuesto = st.sidebar.number_input(
+    "Espera máxima de la recomendación (s)", min_value=0.0, max_value=60.0, step=0.5, value=PRESUPUESTO_SEGUNDOS
+)
 
 
-def classify_dci(age_months, height_cm):
+def get_recommendations_from_openai(cliente, mensajes):
     """
-    Clasifica el riesgo de desnutrición crónica infantil (DCI)
-    basado en un modelo simplificado de talla para la edad.
-    
-    NOTA: Para un uso real, se necesitarían las tablas de la OMS y un cálculo preciso del Z-score.
-    Este es un modelo de reglas simplificado para el proyecto.
+    Pide a la API de OpenAI las recomendaciones personalizadas en streaming.
+    Devuelve un generador de fragmentos; se recorre en un hilo aparte, por
+    lo que no escribe en la página.
     """
-    
-    # Datos de referencia simplificados (basados en promedios de la OMS para niños)
-    # Talla promedio para la edad
-    if age_months <= 24:
-        expected_height = 49.9 + (age_months * 2.5)  # Aprox. 2.5 cm/mes
-    else:
-        expected_height = 90 + ((age_months - 24) * 0.7) # Aprox. 0.7 cm/mes después de 2 años
+    return cliente.transmitir(mensajes)
 
-    # Umbral simplificado: 90% de la talla esperada. Un umbral más preciso sería un Z-score < -2.
-    if height_cm < (expected_height * 0.9):
-        return "Riesgo de Desnutrición Crónica"
-    else:
-        return "Normal"
 
-def get_recommendations_from_openai(age_months, weight_kg, height_cm, dci_status):
+def get_cached_recommendations(age_months, weight_kg, height_cm, dci_status, presupuesto):
     """
-    Envía los datos a la API de OpenAI para generar recomendaciones personalizadas.
+    Muestra de inmediato la guía precalculada para la edad y el estado. Si el
+    primer fragmento de la respuesta del modelo llega dentro de `presupuesto`
+    segundos, la reemplaza y la muestra a medida que llega; las respuestas de
+    la caché de perfiles equivalentes se muestran completas.
     """
-    if not openai_api_key:
-        st.error("Error: La clave de la API de OpenAI no está configurada. Por favor, configura la variable de entorno 'OPENAI_API_KEY'.")
-        return None
-
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {openai_api_key}"
-    }
-
-    prompt = (
-        f"Un niño de {age_months} meses de edad, que pesa {weight_kg} kg y mide {height_cm} cm, "
-        f"ha sido clasificado con un estado de salud de '{dci_status}'. "
-        f"Basado en esta información y en los estándares nutricionales para niños de esta edad, "
-        "por favor, genera una guía práctica y personalizada de alimentación que incluya recomendaciones de alimentos, "
-        "frecuencias y porciones, adaptadas al contexto de una comunidad rural en Ecuador, con énfasis en alimentos locales."
-    )
+    import requests
 
-    data = {
-        "model": "gpt-4o",  # Usamos el modelo más reciente y capaz
-        "messages": [
-            {"role": "system", "content": "Eres un experto en nutrición infantil que provee recomendaciones prácticas."},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.7 #,  # Controla la creatividad de la respuesta
-        #"max_tokens": 500
-    }
+    cliente = ClienteRecomendaciones(openai_api_key)
+    mensajes = construir_mensajes(age_months, weight_kg, height_cm, dci_status)
+    clave = clave_perfil(age_months, weight_kg, height_cm, dci_status)
+    transmision = Transmision()
+    futuro = en_segundo_plano(
+        cache_compartida().get_or_compute,
+        clave,
+        lambda: transmision.consumir(get_recommendations_from_openai(cliente, mensajes)),
+    )
 
+    espacio = st.empty()
+    aviso = st.empty()
     try:
-        response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=data)
-        response.raise_for_status()  # Lanza una excepción para errores HTTP
-        recommendation_text = response.json()["choices"][0]["message"]["content"]
-        return recommendation_text
+        # Los aciertos de caché resuelven casi al instante y no muestran la guía
+        recommendations, a_tiempo = esperar(futuro, ESPERA_CACHE)
+        if not a_tiempo:
+            espacio.markdown(guia_local(age_months, dci_status))
+            aviso.caption("Guía precalculada. Buscando una recomendación personalizada...")
+            if transmision.esperar_inicio(futuro, presupuesto - ESPERA_CACHE):
+                aviso.empty()
+                espacio.write_stream(transmision.fragmentos())
+                recommendations, a_tiempo = futuro.result(), True
+            else:
+                recommendations, a_tiempo = esperar(futuro, 0.0)
+    except requests.exceptions.Timeout as e:
+        metricas.contar("openai_timeouts")
+        mensaje = f"La API de OpenAI no respondió a tiempo: {e}"
     except requests.exceptions.RequestException as e:
-        st.error(f"Error al conectar con la API de OpenAI: {e}")
-        return None
-    except KeyError:
-        st.error("Error al procesar la respuesta de la API. El formato no es el esperado.")
-        return None
+        metricas.contar("openai_errores")
+        mensaje = f"Error al conectar con la API de OpenAI: {e}"
+    except (KeyError, IndexError, ValueError):
+        mensaje = "Error al procesar la respuesta de la API. El formato no es el esperado."
+    else:
+        if not a_tiempo:
+            metricas.contar("recomendaciones_fuera_de_presupuesto")
+            aviso.caption(
+                "La recomendación personalizada no llegó a tiempo; se guardará para la próxima consulta de este perfil."
+            )
+            return None
+        if recommendations:
+            espacio.markdown(recommendations)
+            aviso.empty()
+            return recommendations
+        mensaje = "No se obtuvo una recomendación personalizada."
+
+    espacio.markdown(guia_local(age_months, dci_status))
+    aviso.warning(f"{mensaje}\n\nSe muestra la guía precalculada.")
+    return None
+
+
+def leer_archivo(ruta):
+    """
+    Contenido de un archivo de resultados; se lee solo al pulsar "Descargar".
+    """
+    with open(ruta, "rb") as archivo:
+        return archivo.read()
 
 # --- Interfaz de la aplicación Streamlit ---
 
@@ -104,14 +128,10 @@ else:
  
  
     # Create a session state variable to store the chat messages. This ensures that the
-    # messages persist across reruns.
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
- 
-    # Display the existing chat messages via `st.chat_message`.
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    # messages persist across reruns, and display them via `st.chat_message`.
+    # Only a bounded window is kept in memory; older turns are spilled to disk
+    # and read only when requested.
+    mostrar_historial()
 
 
     st.header("1. Ingreso de Parámetros")
@@ -135,7 +155,8 @@ else:
         st.header("2. Resultados del Análisis")
         
         # 1. Clasificación
-        dci_status = classify_dci(age_months, height_cm)
+        with metricas.span("clasificacion"):
+            dci_status = classify_dci_aproximado(age_months, height_cm)
         # Mostrar el estado de salud coloca un color según el estado
         if dci_status == "Riesgo de Desnutrición Crónica":
             st.error(f"### Estado de Salud Detectado: **{dci_status}**")
@@ -143,44 +164,9 @@ else:
             st.success(f"### Estado de Salud Detectado: **{dci_status}**")
         #
         
-    # Datos de ejemplo de la OMS (talla para la edad para niños, de 0 a 60 meses)
-    # Nota: En un proyecto real, estos datos se cargarían desde un archivo CSV o una base de datos.
-    # Aquí se presentan de forma simplificada para ilustrar el concepto.
-    def get_who_data():
-        data = {
-            'age_months': np.arange(0, 61),
-            'mediana_z0': [
-                49.9, 54.7, 58.4, 61.4, 63.9, 66.0, 67.8, 69.2, 70.6, 71.9, 73.1, 74.5, 75.7, 76.9, 78.0, 79.1, 80.1, 81.1, 82.0, 82.9, 
-                83.8, 84.7, 85.5, 86.4, 87.2, 88.0, 88.8, 89.5, 90.3, 91.0, 91.7, 92.4, 93.0, 93.7, 94.3, 94.9, 95.5, 96.1, 96.7, 97.2, 
-                97.8, 98.4, 98.9, 99.5, 100.0, 100.6, 101.1, 101.7, 102.2, 102.8, 103.3, 103.8, 104.3, 104.8, 105.3, 105.8, 106.3, 106.8, 
-                107.3, 107.8, 108.3
-            ],
-            'desviacion_estandar': [
-                1.8, 2.1, 2.3, 2.4, 2.5, 2.5, 2.6, 2.6, 2.6, 2.6, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 
-                2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 
-                2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 2.7, 
-                2.7
-            ]
-        }
-        return pd.DataFrame(data)
-
-    def classify_dci(age_months, height_cm, who_df):
-        """
-        Clasifica el riesgo de DCI usando el Z-score real de la OMS.
-        """
-        row = who_df[who_df['age_months'] == age_months].iloc[0]
-        mediana = row['mediana_z0']
-        desviacion_estandar = row['desviacion_estandar']
-        
-        z_score = (height_cm - mediana) / desviacion_estandar
-        
-        if z_score < -2:
-            return "Riesgo de Desnutrición Crónica"
-        else:
-            return "Normal"
-
     # Carga de datos de la OMS
-    who_df = get_who_data()
+    with metricas.span("tabla_oms"):
+        who_df = get_who_data()
 
 
     st.markdown("---")
@@ -193,45 +179,93 @@ else:
         
         st.subheader("Gráfico Comparativo: Estatura vs. Estándares de Referencia")
         
-        # Calcular los rangos de la OMS usando los datos de referencia
-        who_df['Z-score +2'] = who_df['mediana_z0'] + (who_df['desviacion_estandar'] * 2)
-        who_df['Z-score 0'] = who_df['mediana_z0']
-        who_df['Z-score -2'] = who_df['mediana_z0'] - (who_df['desviacion_estandar'] * 2)
-
-        # Crear el gráfico con Plotly
-        fig = px.line(
-            who_df,
-            x='age_months',
-            y=['Z-score +2', 'Z-score 0', 'Z-score -2'],
-            labels={'age_months': 'Edad (meses)', 'value': 'Estatura (cm)', 'variable': 'Curva de Crecimiento'},
-            title='Estatura del Niño en Comparación con los Estándares de la OMS'
-        )
-        
-        # Personalizar las líneas y el legend
-        fig.data[0].name = 'Máximo (Z-score +2)'
-        fig.data[1].name = 'Normal (Z-score 0)'
-        fig.data[2].name = 'Umbral DCI (Z-score -2)'
-        fig.data[0].line.color = 'blue'
-        fig.data[1].line.color = 'green'
-        fig.data[2].line.color = 'orange'
-        
-        # Agregar el punto del niño
-        fig.add_scatter(
-            x=[age_months], 
-            y=[height_cm], 
-            mode='markers', 
-            name='Estatura del Niño',
-            marker=dict(color='red', size=15)
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        # Las curvas de referencia se construyen una vez por proceso; solo se agrega el punto del niño
+        with metricas.span("grafico"):
+            fig = figura_talla_edad(who_df, age_months, height_cm)
+            st.plotly_chart(fig, use_container_width=True)
 
         # 3. Recomendaciones de OpenAI
         st.subheader("Recomendaciones de Alimentación Personalizada")
-        with st.spinner("Generando recomendaciones..."):
-            recommendations = get_recommendations_from_openai(age_months, weight_kg, height_cm, dci_status)
-            if recommendations:
-                st.markdown(recommendations)
+        with metricas.span("recomendaciones"):
+            get_cached_recommendations(age_months, weight_kg, height_cm, dci_status, presupuesto)
+
+    # Contadores de la caché de recomendaciones
+    with st.sidebar.expander("Caché de recomendaciones"):
+        estadisticas = cache_compartida().estadisticas()
+        st.write(f"Aciertos: {estadisticas['hits_memoria'] + estadisticas['hits_disco'] + estadisticas['compartidas']}")
+        st.write(f"Fallos: {estadisticas['misses']}")
+        st.write(f"Tasa de aciertos: {estadisticas['tasa_aciertos']:.0%}")
+        st.write(f"Tiempo ahorrado (estimado): {estadisticas['segundos_ahorrados']:.1f} s")
+
+st.markdown("---")
+
+# --- Tamizaje de cohortes a partir de un archivo ---
+st.header("Tamizaje de Cohortes (CSV o Parquet)")
+st.markdown(
+    "Sube una planilla con columnas de edad en meses (`age_months` o `edad_meses`) "
+    "y estatura en cm (`height_cm` o `estatura_cm`). El archivo se procesa por bloques. "
+    "Si incluye peso (`peso_kg`), sexo, código del niño y fecha, también se revisan; "
+    "las filas con valores implausibles o duplicadas quedan en cuarentena."
+)
+archivo_cohorte = st.file_uploader("Archivo de mediciones", type=["csv", "parquet"])
+if archivo_cohorte is not None and st.button("Procesar cohorte"):
+    barra = st.progress(0.0, text="Procesando...")
+    col_filas, col_riesgo, col_prevalencia = st.columns(3)
+    metrica_filas = col_filas.empty()
+    metrica_riesgo = col_riesgo.empty()
+    metrica_prevalencia = col_prevalencia.empty()
+
+    # El resultado se escribe en disco, en una carpeta propia de la sesión que
+    # cada corrida sobrescribe y que se borra cuando la sesión termina
+    if "carpeta_cohorte" not in st.session_state:
+        st.session_state.carpeta_cohorte = tempfile.TemporaryDirectory(prefix="cohorte_")
+    ruta_salida = os.path.join(st.session_state.carpeta_cohorte.name, "cohorte.csv")
+    ruta_cuarentena = os.path.join(st.session_state.carpeta_cohorte.name, "cuarentena.csv")
+    resumen = None
+    try:
+        with metricas.span("cohorte"):
+            bloques = iter_bloques(archivo_cohorte, archivo_cohorte.name)
+            for resumen in screen_cohort(bloques, get_who_data(), ruta_salida, ruta_cuarentena):
+                barra.progress(resumen["avance"], text=f"Procesadas {resumen['filas']:,} filas")
+                metrica_filas.metric("Niños evaluados", f"{resumen['filas']:,}")
+                metrica_riesgo.metric("Riesgo de DCI", f"{resumen['riesgo']:,}")
+                metrica_prevalencia.metric("Prevalencia parcial", f"{resumen['prevalencia']:.1%}")
+    except ValueError as e:
+        st.error(f"No se pudo procesar el archivo: {e}")
+    else:
+        barra.progress(1.0, text="Proceso completado")
+        if resumen and resumen["fuera_rango"]:
+            st.warning(f"{resumen['fuera_rango']:,} filas tienen una edad fuera del rango de referencia (0-60 meses).")
+        st.session_state.ruta_cohorte = ruta_salida
+        st.session_state.ruta_cuarentena = ruta_cuarentena
+        st.session_state.validacion_cohorte = resumen["validacion"] if resumen else None
+
+if st.session_state.get("ruta_cohorte"):
+    ruta_cohorte = st.session_state.ruta_cohorte
+    st.download_button(
+        "Descargar resultados",
+        data=functools.partial(leer_archivo, ruta_cohorte),
+        file_name="cohorte_clasificada.csv",
+        mime="text/csv",
+    )
+    validacion = st.session_state.validacion_cohorte
+    if validacion and validacion["cuarentena"]:
+        st.warning(f"{validacion['cuarentena']:,} de {validacion['filas']:,} filas quedaron en cuarentena y no se clasificaron.")
+        st.dataframe(
+            [{"motivo": motivo, "filas": cantidad} for motivo, cantidad in validacion["motivos"].items() if cantidad],
+            hide_index=True,
+        )
+        ruta_cuarentena = st.session_state.ruta_cuarentena
+        st.download_button(
+            "Descargar filas en cuarentena",
+            data=functools.partial(leer_archivo, ruta_cuarentena),
+            file_name="cohorte_cuarentena.csv",
+            mime="text/csv",
+        )
+
+# --- Panel de perfilado ---
+metricas.mostrar_panel(cache_compartida().estadisticas)
+
 st.markdown("---")
 st.caption("© 2025 | Desarrollado por [Diego Marcelo Altamirano Plazarte] | Maestría en Inteligencia Artificial | Fundamentos de Inteligencia Artificial")        
         
\ No newline at end of file
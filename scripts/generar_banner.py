@@ -0,0 +1,56 @@
+"""
+Genera la imagen de portada de app.py (dci/data/static/banner.png).
+
+La imagen se guarda en el repositorio para que la página no descargue nada
+en cada visita. Se ejecuta solo cuando cambia el diseño:
+
+    python scripts/generar_banner.py
+"""
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.patches import Circle, Rectangle  # noqa: E402
+
+DESTINO = Path(__file__).resolve().parent.parent / "dci" / "data" / "static" / "banner.png"
+
+# Alimentos de la zona: (etiqueta, color, x, y, radio), en pulgadas sobre un lienzo de 12 x 3.2
+ALIMENTOS = (
+    ("Quinua", "#e9c46a", 1.4, 1.45, 0.50),
+    ("Chochos", "#f4e3b1", 3.2, 1.20, 0.42),
+    ("Huevo", "#fff3d6", 4.9, 1.45, 0.40),
+    ("Zanahoria", "#f4a261", 7.0, 1.20, 0.45),
+    ("Acelga", "#6a994e", 8.8, 1.45, 0.48),
+    ("Tomate de árbol", "#d62828", 10.6, 1.20, 0.42),
+)
+
+
+def generar():
+    figura = plt.figure(figsize=(12, 3.2), dpi=100)
+    ax = figura.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, 12)
+    ax.set_ylim(0, 3.2)
+    ax.set_aspect("equal")
+    ax.axis("off")
+    ax.add_patch(Rectangle((0, 0), 12, 3.2, color="#fdf6ec"))
+    ax.add_patch(Rectangle((0, 0), 12, 0.45, color="#f1e0c5"))
+
+    for etiqueta, color, x, y, radio in ALIMENTOS:
+        ax.add_patch(Circle((x, y), radio, color=color, ec="#7f5539", lw=1.5))
+        ax.text(x, y - radio - 0.1, etiqueta, ha="center", va="top", fontsize=11, color="#5c3d2e")
+
+    ax.text(6, 2.85, "Alimentación balanceada en la primera infancia", ha="center", va="center",
+            fontsize=22, fontweight="bold", color="#7f5539")
+    ax.text(6, 2.45, "Granos andinos, leguminosas, huevo, frutas y verduras de la zona", ha="center",
+            va="center", fontsize=13, color="#5c3d2e")
+
+    DESTINO.parent.mkdir(parents=True, exist_ok=True)
+    figura.savefig(DESTINO, format="png")
+    plt.close(figura)
+
+
+if __name__ == "__main__":
+    generar()
+    print(f"Imagen escrita en {DESTINO}")
@@ -0,0 +1,126 @@
+"""
+Genera el catálogo de guías de alimentación precalculadas (dci/data/guias.json).
+
+Cada guía combina las pautas de alimentación de una banda de edad con el
+énfasis que corresponde al estado nutricional; para los menores de 6 meses el
+énfasis es solo sobre la lactancia materna exclusiva. Se ejecuta solo cuando cambia
+el contenido:
+
+    python scripts/generar_guias.py
+"""
+import json
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from dci.clasificacion import BANDAS_EDAD  # noqa: E402
+
+DESTINO = RAIZ / "dci" / "data" / "guias.json"
+
+PAUTAS_POR_BANDA = {
+    "0-5": [
+        "**Lactancia materna exclusiva:** solo leche materna, a libre demanda, de día y de noche (8 a 12 veces al día).",
+        "**Sin otros líquidos:** no dar agua, aguas aromáticas, coladas ni jugos antes de los 6 meses.",
+        "**La madre también se alimenta:** una comida extra al día con huevo, leche, chochos o carne, y abundantes líquidos.",
+    ],
+    "6-11": [
+        "**Leche materna primero:** continuar el pecho a libre demanda y ofrecer después la comida.",
+        "**Comidas espesas:** papillas y purés que no se escurran de la cuchara (no caldos), de 2 a 3 veces al día a los 6-8 meses y de 3 a 4 veces a los 9-11 meses, más 1 o 2 refrigerios.",
+        "**Porción:** empezar con 2 o 3 cucharadas y llegar a media taza (6-8 meses) o tres cuartos de taza (9-11 meses).",
+        "**Alimentos locales:** puré de zapallo, papa, melloco o zanahoria con hígado, yema de huevo o pollo desmenuzado; colada espesa de máchica o quinua; chochos pelados y licuados.",
+    ],
+    "12-23": [
+        "**Comida de la familia:** en trozos pequeños, 3 a 4 comidas al día más 2 refrigerios, en su propio plato (una taza por comida).",
+        "**Seguir con la leche materna** hasta los 2 años o más.",
+        "**Cada comida con proteína:** un huevo al día, chochos, habas, fréjol, lenteja, queso, leche, cuy, pollo o trucha.",
+        "**Primero el segundo:** lo sólido antes que la sopa; la sopa no reemplaza al plato principal.",
+    ],
+    "24-35": [
+        "**3 comidas y 2 refrigerios:** horarios regulares y en familia, sin pantallas.",
+        "**Granos andinos y leguminosas:** quinua, máchica, mote con habas o chochos, fréjol con arroz.",
+        "**Frutas y verduras de temporada:** tomate de árbol, mandarina, babaco, acelga, zanahoria y zapallo todos los días.",
+    ],
+    "36-47": [
+        "**3 comidas y 2 refrigerios:** porciones parecidas a las de un adulto pequeño.",
+        "**Lonchera casera:** fruta entera, mote con queso, habas tiernas, chochos con tostado o un vaso de leche.",
+        "**Agua hervida** en lugar de gaseosas o jugos envasados.",
+    ],
+    "48-60": [
+        "**3 comidas y 2 refrigerios** con desayuno completo antes de la escuela.",
+        "**Proteína en cada comida:** huevo, leche o yogur natural, queso, chochos, fréjol, pollo, cuy o pescado.",
+        "**Evitar procesados:** snacks de funda, golosinas y bebidas azucaradas quitan el apetito y no nutren.",
+    ],
+}
+
+ENFASIS_POR_ESTADO = {
+    "riesgo": (
+        "Guía de Alimentación para Recuperar el Crecimiento",
+        [
+            "**Énfasis en micronutrientes:** alimentos ricos en hierro y zinc (hígado, sangre cocida, carne, lentejas, hojas verdes) acompañados de frutas con vitamina C.",
+            "**Aumentar la densidad calórica:** añadir una cucharadita de aceite, mantequilla o aguacate a la porción del niño sin aumentar el volumen.",
+            "**Frecuencia:** ofrecer 5 a 6 comidas pequeñas y nutritivas a lo largo del día.",
+            "**Seguimiento:** acudir al centro de salud para control de peso y talla, micronutrientes y desparasitación según indicación.",
+        ],
+    ),
+    "normal": (
+        "Guía de Alimentación para Crecimiento Saludable",
+        [
+            "**Dieta balanceada:** continuar con frutas, verduras, granos enteros y proteínas en cada comida.",
+            "**Hábitos saludables:** agua hervida, lavado de manos y límite a los alimentos procesados y azúcares.",
+            "**Controles:** mantener los controles de crecimiento y las vacunas al día.",
+        ],
+    ),
+    "otro": (
+        "Recomendaciones Generales",
+        [
+            "**Consultar a un pediatra** para una evaluación completa.",
+            "**Dieta balanceada y variada** con alimentos de la zona.",
+        ],
+    ),
+}
+
+# Antes de los 6 meses el niño solo toma leche materna: el énfasis se pone en
+# la lactancia y nunca en alimentos complementarios
+ENFASIS_LACTANCIA_EXCLUSIVA = {
+    "riesgo": [
+        "**Revisar la lactancia:** buen agarre y posición, vaciar un pecho antes de ofrecer el otro y no limitar la duración de las tomas.",
+        "**Más tomas:** al menos 8 a 12 al día, también de noche; despertar al bebé si duerme más de 3 horas seguidas.",
+        "**Sin agregados:** no dar aceite, coladas, fórmulas ni otros líquidos salvo indicación del personal de salud.",
+        "**Seguimiento:** acudir al centro de salud esta semana para control de peso y talla y apoyo con la lactancia.",
+    ],
+    "normal": [
+        "**Continuar la lactancia materna exclusiva** hasta los 6 meses.",
+        "**Hábitos saludables:** lavado de manos antes de dar el pecho y después de cambiar el pañal.",
+        "**Controles:** mantener los controles de crecimiento y las vacunas al día.",
+    ],
+    "otro": [
+        "**Consultar a un pediatra** para una evaluación completa.",
+        "**Continuar la lactancia materna exclusiva** hasta los 6 meses.",
+    ],
+}
+BANDA_LACTANCIA_EXCLUSIVA = "0-5"
+
+
+def _enfasis(banda, estado):
+    if banda == BANDA_LACTANCIA_EXCLUSIVA:
+        return ENFASIS_LACTANCIA_EXCLUSIVA[estado]
+    return ENFASIS_POR_ESTADO[estado][1]
+
+
+def generar():
+    guias = {}
+    for inicio, fin in BANDAS_EDAD:
+        banda = f"{inicio}-{fin}"
+        for estado, (titulo, _) in ENFASIS_POR_ESTADO.items():
+            lineas = [f"**{titulo} ({banda} meses):**"]
+            lineas += [f"- {pauta}" for pauta in PAUTAS_POR_BANDA[banda] + _enfasis(banda, estado)]
+            lineas.append("\n_Guía general precalculada. No reemplaza la consulta con el personal de salud._")
+            guias[f"{banda}|{estado}"] = "\n".join(lineas)
+    return guias
+
+
+if __name__ == "__main__":
+    DESTINO.write_text(json.dumps(generar(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Guías escritas en {DESTINO}")
@@ -0,0 +1,45 @@
+"""
+Genera los arreglos binarios de dci/data/oms a partir de las tablas LMS
+expandidas (por día) de los Patrones de Crecimiento Infantil de la OMS.
+
+Las tablas de origen se toman del paquete pygrowup2, que las distribuye tal
+como las publica la OMS. Solo hace falta ejecutarlo cuando cambien las tablas:
+
+    pip install pygrowup2
+    python scripts/generar_tablas_oms.py
+"""
+from importlib import import_module
+from pathlib import Path
+
+import numpy as np
+
+DESTINO = Path(__file__).resolve().parent.parent / "dci" / "data" / "oms"
+
+# indicador de dci.referencia -> tabla de pygrowup
+TABLAS = {
+    "talla_edad": "lfa",
+    "peso_edad": "wfa",
+    "peso_longitud": "wfl",
+    "peso_talla": "wfh",
+    "imc_edad": "bmifa",
+}
+SEXOS = ("male", "female")
+
+
+def convertir(tabla):
+    datos = import_module(f"pygrowup.tables.by_day.{tabla}").DATA
+    claves = sorted(datos[SEXOS[0]])
+    arreglo = np.empty((len(SEXOS), len(claves), 3), dtype=np.float32)
+    for i, sexo in enumerate(SEXOS):
+        for j, clave in enumerate(claves):
+            fila = datos[sexo][clave]
+            arreglo[i, j] = (float(fila["l"]), float(fila["m"]), float(fila["s"]))
+    return arreglo, float(claves[0]), float(claves[1] - claves[0])
+
+
+if __name__ == "__main__":
+    DESTINO.mkdir(parents=True, exist_ok=True)
+    for indicador, tabla in TABLAS.items():
+        arreglo, inicio, paso = convertir(tabla)
+        np.save(DESTINO / f"{indicador}.npy", arreglo)
+        print(f"{indicador}: {arreglo.shape[1]} filas desde {inicio} con paso {paso}")
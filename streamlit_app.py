@@ -1,6 +1,13 @@
+from dotenv import load_dotenv
+load_dotenv()
+
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+from dci import evaluar_imc, metricas
+from dci.registro import registro_compartido
+
+# Perfilado del rerun y recursos compartidos
+metricas.iniciar_pagina("streamlit_app.py")
 
 # sección de encabezado de la app
 seccionHeader = st.container()
@@ -15,11 +22,34 @@ with seccionDatos:
     st.header("Datos del menor de 5 años")
     st.text("En esta sección se ingresan los datos del menor de 5 años")
     nombre = st.text_input("Nombre del menor")
+    codigo = st.text_input("Código o cédula del menor", help="Identifica al menor entre visitas. Si se deja vacío se usa el nombre.")
+    sexo = st.radio("Sexo del menor", ["Femenino", "Masculino"], horizontal=True)
+    comunidad = st.text_input("Comunidad", value="San Antonio de Aláquez")
+    fecha_visita = st.date_input("Fecha de la visita")
     edad = st.number_input("Edad del menor (en meses)", min_value=0, max_value=60, step=1)
     peso = st.number_input("Peso del menor (en kg)", min_value=0.0, max_value=50.0, step=0.1)
     estatura = st.number_input("Estatura del menor (en cm)", min_value=0.0, max_value=150.0, step=0.1)
+    codigo_menor = (codigo or nombre).strip()
     if st.button("Guardar datos"):
-        st.success(f"Datos guardados: {nombre}, {edad} meses, {peso} kg, {estatura} cm")    
+        if codigo_menor and peso > 0 and estatura > 0:
+            with metricas.span("registro_guardar"):
+                registro_compartido().registrar_visita(
+                    codigo_menor, fecha_visita.isoformat(), edad, peso, estatura,
+                    nombre=nombre or None, sexo=sexo, comunidad=comunidad or None,
+                )
+            st.success(f"Datos guardados: {nombre}, {edad} meses, {peso} kg, {estatura} cm")
+        else:
+            st.warning("Ingrese el nombre o código del menor, su peso y su estatura para guardar la visita.")
+
+    # Historial de visitas del menor con su velocidad de crecimiento
+    if codigo_menor:
+        with metricas.span("registro_historial"):
+            historial = registro_compartido().historial(codigo_menor)
+        if historial:
+            st.subheader(f"Historial de {codigo_menor}")
+            st.dataframe(historial, hide_index=True)
+            if len(historial) > 1:
+                st.line_chart(historial, x="fecha", y=["z_talla_edad", "z_peso_edad"])
 
 # sección de análisis de desnutrición
 seccionAnalisis = st.container()
@@ -30,10 +60,14 @@ with seccionAnalisis:
     if st.button("Analizar desnutrición"):
         if edad > 0 and peso > 0 and estatura > 0:
             # Cálculo del índice de masa corporal (IMC) como ejemplo simple
-            imc = peso / ((estatura / 100) ** 2)
-            if imc < 14.0:
+            with metricas.span("clasificacion"):
+                imc, desnutricion = evaluar_imc(peso, estatura)
+            if desnutricion:
                 st.error(f"El menor {nombre} presenta desnutrición crónica (IMC: {imc:.2f})")
             else:
                 st.success(f"El menor {nombre} no presenta desnutrición crónica (IMC: {imc:.2f})")
         else:
             st.warning("Por favor, ingrese todos los datos del menor para realizar el análisis.")
+
+# --- Panel de perfilado ---
+metricas.mostrar_panel()
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# El estado en disco (caché, historial, registro, métricas) debe ir a una carpeta
+# temporal antes de importar dci, porque las rutas se leen al importar
+_temporal = tempfile.mkdtemp(prefix="dci_tests_")
+os.environ["DCI_CACHE_DIR"] = os.path.join(_temporal, "cache")
+os.environ["DCI_DATOS_DIR"] = os.path.join(_temporal, "datos")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
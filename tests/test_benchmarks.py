@@ -0,0 +1,52 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+RUTA = Path(__file__).resolve().parent.parent / "benchmarks" / "ejecutar.py"
+
+
+@pytest.fixture(scope="module")
+def ejecutar():
+    especificacion = importlib.util.spec_from_file_location("benchmarks_ejecutar", RUTA)
+    modulo = importlib.util.module_from_spec(especificacion)
+    especificacion.loader.exec_module(modulo)
+    yield modulo
+    modulo._servidor.shutdown()
+    modulo._servidor.server_close()
+
+
+def test_medir_repite_hasta_el_minimo(ejecutar):
+    llamadas = []
+    estadisticas = ejecutar.medir(lambda: llamadas.append(1), minimo_segundos=0, minimo_repeticiones=5)
+    assert estadisticas["repeticiones"] == 5
+    assert len(llamadas) == 6  # más el calentamiento
+    assert estadisticas["min_s"] <= estadisticas["mediana_s"] <= estadisticas["p95_s"]
+
+
+def test_comparar_detecta_solo_las_regresiones_sobre_la_tolerancia(ejecutar):
+    base = {"resultados": [
+        {"caso": "a", "n": 1, "mediana_s": 1.0},
+        {"caso": "b", "n": 1, "mediana_s": 1.0},
+        {"caso": "c", "n": 1, "mediana_s": 1.0},
+    ]}
+    actual = {"resultados": [
+        {"caso": "a", "n": 1, "mediana_s": 1.1},
+        {"caso": "b", "n": 1, "mediana_s": 1.5},
+        {"caso": "c", "n": 1000, "mediana_s": 9.0},
+    ]}
+    assert ejecutar.comparar(actual, base, 0.2) == [("b", 1, 1.0, 1.5)]
+
+
+def test_cargar_todas_abre_las_tablas_en_cada_repeticion(ejecutar, monkeypatch):
+    from dci import referencia
+
+    cargas = []
+    cargar = referencia.np.load
+    monkeypatch.setattr(referencia.np, "load", lambda *args, **kwargs: cargas.append(1) or cargar(*args, **kwargs))
+    casos = ejecutar.grupo_referencia()
+    next(casos)  # construir_who_df
+    caso, n, estadisticas = next(casos)
+
+    assert caso == "referencia/cargar_todas"
+    assert len(cargas) == n * (estadisticas["repeticiones"] + 1)
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from dci.cache import CacheRecomendaciones, clave_perfil
+
+
+def test_perfiles_equivalentes_comparten_clave():
+    assert clave_perfil(13, 9.12, 74.4, "Normal") == clave_perfil(14, 9.2, 74.0, "Normal")
+    assert clave_perfil(13, 9.12, 74.4, "Normal") != clave_perfil(13, 9.12, 74.4, "Riesgo de Desnutrición Crónica")
+
+
+def test_una_sola_consulta_por_clave_con_sesiones_concurrentes(tmp_path):
+    cache = CacheRecomendaciones(tmp_path / "cache.sqlite")
+    llamadas = []
+    barrera = threading.Barrier(8)
+
+    def calcular():
+        llamadas.append(1)
+        time.sleep(0.2)
+        return "guía"
+
+    resultados = []
+
+    def sesion():
+        barrera.wait()
+        resultados.append(cache.get_or_compute("clave", calcular))
+
+    hilos = [threading.Thread(target=sesion) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(llamadas) == 1
+    assert resultados == ["guía"] * 8
+    estadisticas = cache.estadisticas()
+    assert (estadisticas["consultas"], estadisticas["compartidas"]) == (1, 7)
+
+
+def test_errores_no_se_guardan(tmp_path):
+    cache = CacheRecomendaciones(tmp_path / "cache.sqlite")
+    assert cache.get_or_compute("clave", lambda: None) is None
+    assert cache.get_or_compute("clave", lambda: "guía") == "guía"
+
+
+def test_el_disco_sobrevive_al_reinicio_y_expira_por_ttl(tmp_path):
+    ruta = tmp_path / "cache.sqlite"
+    CacheRecomendaciones(ruta).put("clave", "guía")
+    assert CacheRecomendaciones(ruta).get("clave") == "guía"
+    assert CacheRecomendaciones(ruta, ttl_segundos=-1).get("clave") is None
+
+
+def test_desalojo_lru_en_memoria_y_disco(tmp_path):
+    cache = CacheRecomendaciones(tmp_path / "cache.sqlite", max_memoria=2, max_disco=2)
+    for clave in ("a", "b", "c"):
+        cache.put(clave, clave.upper())
+    estadisticas = cache.estadisticas()
+    assert (estadisticas["entradas_memoria"], estadisticas["entradas_disco"]) == (2, 2)
+    assert cache.get("a") is None
+    assert cache.get("c") == "C"
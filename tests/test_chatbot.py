@@ -0,0 +1,18 @@
+from dci import chatbot
+
+
+def test_responde_con_el_documento_mas_parecido():
+    respuestas = chatbot.responder("¿Cómo se mide la DESNUTRICION cronica?")
+    assert respuestas[0][1] == "dci-medicion"
+    puntajes = [r[0] for r in respuestas]
+    assert puntajes == sorted(puntajes, reverse=True)
+    assert all(p >= chatbot.UMBRAL_RESPUESTA for p in puntajes)
+
+
+def test_pregunta_sin_terminos_conocidos_no_tiene_respuesta():
+    assert chatbot.responder("xyz qwerty") == ()
+    assert chatbot.responder("¿y el?") == ()
+
+
+def test_tokenizar_quita_tildes_y_palabras_vacias():
+    assert chatbot.tokenizar("¿Qué es la Desnutrición crónica?") == ["desnut", "cronic"]
@@ -0,0 +1,20 @@
+from dci.cache import clave_perfil
+from dci.clasificacion import banda_edad
+from dci.registro import RegistroMediciones
+
+
+def test_bandas_con_edades_fraccionarias():
+    assert banda_edad(5.5) == "0-5"
+    assert banda_edad(6) == "6-11"
+    assert banda_edad(23.9) == "12-23"
+    assert banda_edad(60) == "48-60"
+    assert banda_edad(72) == "72"
+    assert clave_perfil(23.9, 11.0, 80.0, "Normal") == clave_perfil(12, 11.0, 80.0, "Normal")
+
+
+def test_prevalencia_solo_con_bandas_reales(tmp_path):
+    registro = RegistroMediciones(tmp_path / "registro.sqlite")
+    registro.registrar_visita("A", "2024-06-01", 5.5, 7.0, 65.0, sexo="F")
+    registro.registrar_visita("B", "2024-06-01", 23.9, 11.0, 85.0, sexo="M")
+    bandas = {grupo["banda_edad"] for grupo in registro.prevalencia(por=("banda_edad",))}
+    assert bandas == {"0-5", "12-23"}
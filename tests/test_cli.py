@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dci import cli
+from dci.zscore import classify_dci_df
+
+
+def _leer_partes(carpeta, prefijo="part"):
+    archivos = sorted(carpeta.glob(f"{prefijo}-*.csv"))
+    return [archivo.read_bytes() for archivo in archivos]
+
+
+@pytest.fixture
+def encuesta(tmp_path):
+    rng = np.random.default_rng(5)
+    n = 3_000
+    datos = pd.DataFrame({
+        "child_id": [f"N{i:05d}" for i in range(n)],
+        "fecha": "2024-05-01",
+        "edad_meses": rng.integers(0, 61, n),
+        "estatura_cm": rng.normal(85, 8, n).round(1),
+    })
+    ruta = tmp_path / "encuesta.csv"
+    datos.to_csv(ruta, index=False)
+    return ruta, datos
+
+
+def test_la_salida_no_depende_de_la_cantidad_de_procesos(tmp_path, encuesta):
+    ruta, datos = encuesta
+    uno = cli.ejecutar(str(ruta), str(tmp_path / "uno"), procesos=1, bytes_por_parte=10_000, validar=False)
+    dos = cli.ejecutar(str(ruta), str(tmp_path / "dos"), procesos=2, bytes_por_parte=10_000, validar=False)
+
+    assert uno["partes"] > 5
+    assert _leer_partes(tmp_path / "uno") == _leer_partes(tmp_path / "dos")
+    assert {k: uno[k] for k in ("filas", "normal", "riesgo", "fuera_rango")} == \
+        {k: dos[k] for k in ("filas", "normal", "riesgo", "fuera_rango")}
+
+    # Los cortes por bytes no pierden ni repiten filas
+    unido = pd.concat(pd.read_csv(archivo) for archivo in sorted((tmp_path / "uno").glob("part-*.csv")))
+    esperado = classify_dci_df(datos, age_col="edad_meses", height_col="estatura_cm")
+    assert unido["child_id"].tolist() == datos["child_id"].tolist()
+    assert unido["dci_codigo"].tolist() == esperado["dci_codigo"].tolist()
+
+
+def test_main_informa_error_sin_columnas(tmp_path, capsys):
+    ruta = tmp_path / "malo.csv"
+    ruta.write_text("peso\n10\n", encoding="utf-8")
+    assert cli.main([str(ruta), "--salida", str(tmp_path / "salida"), "--procesos", "1"]) == 1
+    assert "Error" in capsys.readouterr().err
+
+
+def test_visita_duplicada_entre_partes_se_puntua_una_sola_vez(tmp_path):
+    filas = ["child_id,fecha,edad_meses,estatura_cm"]
+    filas += [f"N{i:04d},2024-05-01,24,86.0" for i in range(400)]
+    # La misma visita al principio y al final del archivo, en partes distintas
+    filas[-1] = "N0000,2024-05-01,24,86.0"
+    ruta = tmp_path / "encuesta.csv"
+    ruta.write_text("\n".join(filas) + "\n", encoding="utf-8")
+
+    resultados = {}
+    for procesos in (1, 3):
+        carpeta = tmp_path / f"salida{procesos}"
+        totales = cli.ejecutar(str(ruta), str(carpeta), procesos=procesos, bytes_por_parte=2_000)
+        assert totales["partes"] > 2
+        assert totales["filas"] == 399
+        assert totales["validacion"]["cuarentena"] == 1
+        assert totales["validacion"]["motivos"]["visita duplicada"] == 1
+        resultados[procesos] = (_leer_partes(carpeta), _leer_partes(carpeta, "cuarentena"))
+
+        puntuadas = pd.concat(pd.read_csv(archivo) for archivo in sorted(carpeta.glob("part-*.csv")))
+        assert len(puntuadas) == 399
+        assert puntuadas["child_id"].tolist()[0] == "N0000"
+        assert puntuadas["child_id"].is_unique
+        cuarentena = pd.concat(pd.read_csv(archivo) for archivo in sorted(carpeta.glob("cuarentena-*.csv")))
+        assert cuarentena["child_id"].tolist() == ["N0000"]
+        assert cuarentena["motivos"].tolist() == ["visita duplicada"]
+
+    assert resultados[1] == resultados[3]
+
+
+def test_duplicados_no_dependen_del_tamano_de_parte(tmp_path):
+    filas = ["child_id,fecha,edad_meses,estatura_cm"]
+    filas += [f"N{i:04d},2024-05-01,24,86.0" for i in range(400)]
+    # La primera copia va a cuarentena por la talla; la segunda es válida
+    filas[1] = "N0000,2024-05-01,24,860.0"
+    filas[-1] = "N0000,2024-05-01,24,86.0"
+    ruta = tmp_path / "encuesta.csv"
+    ruta.write_text("\n".join(filas) + "\n", encoding="utf-8")
+
+    resultados = []
+    for bytes_por_parte in (cli.BYTES_POR_PARTE, 2_000):
+        carpeta = tmp_path / f"salida{bytes_por_parte}"
+        totales = cli.ejecutar(str(ruta), str(carpeta), procesos=1, bytes_por_parte=bytes_por_parte)
+        puntuadas = pd.concat(pd.read_csv(archivo) for archivo in sorted(carpeta.glob("part-*.csv")))
+        cuarentena = pd.concat(pd.read_csv(archivo) for archivo in sorted(carpeta.glob("cuarentena-*.csv")))
+        resultados.append((totales["partes"], totales["filas"], totales["validacion"]["motivos"],
+                           puntuadas["child_id"].tolist(), cuarentena["motivos"].tolist()))
+
+    (partes_uno, *uno), (partes_varias, *varias) = resultados
+    assert partes_uno == 1 and partes_varias > 2
+    assert uno == varias
+    assert uno[0] == 399
+    assert uno[1]["visita duplicada"] == 0
+    assert uno[3] == ["talla en mm; talla/edad implausible"]
+
+
+def test_encabezado_con_nombres_entre_comillas(tmp_path, capsys):
+    ruta = tmp_path / "desde_r.csv"
+    ruta.write_text('"child_id","edad_meses","estatura_cm"\n"1",24,86.0\n"2",36,95.0\n', encoding="utf-8")
+    assert cli.planificar(str(ruta))[0] == ["child_id", "edad_meses", "estatura_cm"]
+    assert cli.main([str(ruta), "--salida", str(tmp_path / "salida"), "--procesos", "1"]) == 0
+    assert "Filas clasificadas:  2" in capsys.readouterr().out
@@ -0,0 +1,77 @@
+import json
+import socket
+import sys
+import time
+
+import pytest
+import requests
+
+from dci import simulador_openai
+from dci.cliente_openai import ClienteRecomendaciones, construir_mensajes
+
+MENSAJES = construir_mensajes(24, 11.0, 80.0, "Normal")
+
+
+@pytest.fixture
+def simulador():
+    servidores = []
+
+    def iniciar(timeout=5.0, **opciones):
+        servidor = simulador_openai.iniciar(**opciones)
+        servidores.append(servidor)
+        url = f"http://127.0.0.1:{servidor.server_port}/v1"
+        return servidor, ClienteRecomendaciones("sk-prueba", url_base=url, timeout_lectura=timeout)
+
+    yield iniciar
+    for servidor in servidores:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def test_completar_devuelve_el_texto(simulador):
+    _, cliente = simulador()
+    assert cliente.completar(MENSAJES) == simulador_openai.RESPUESTA
+
+
+def test_transmitir_entrega_fragmentos_antes_de_terminar(simulador):
+    _, cliente = simulador(retardo=0.02)
+    inicio = time.perf_counter()
+    fragmentos = cliente.transmitir(MENSAJES)
+    primero = next(fragmentos)
+    tiempo_primero = time.perf_counter() - inicio
+    resto = list(fragmentos)
+    tiempo_total = time.perf_counter() - inicio
+
+    assert primero + "".join(resto) == simulador_openai.RESPUESTA
+    assert tiempo_primero < tiempo_total / 4
+
+
+@pytest.mark.parametrize("estado", [429, 503])
+def test_reintenta_ante_429_y_5xx(simulador, estado):
+    servidor, cliente = simulador(fallos=2, estado_fallo=estado)
+    assert cliente.completar(MENSAJES) == simulador_openai.RESPUESTA
+    assert servidor.solicitudes == 3
+
+
+def test_tiempo_limite_de_lectura(simulador):
+    servidor, cliente = simulador(retardo=0.1, timeout=0.2)
+    inicio = time.perf_counter()
+    with pytest.raises(requests.exceptions.Timeout):
+        cliente.completar(MENSAJES)
+    assert time.perf_counter() - inicio < 2
+    # Los tiempos límite de lectura no se reintentan
+    assert servidor.solicitudes == 1
+
+
+def test_simulador_ignora_clientes_que_cierran_antes_de_la_respuesta(simulador):
+    servidor, _ = simulador(respuesta=" ".join(["palabra"] * 200_000))
+    errores = []
+    servidor.handle_error = lambda solicitud, direccion: errores.append(sys.exc_info()[0])
+    cuerpo = json.dumps({"stream": False}).encode()
+    for _ in range(3):
+        with socket.create_connection(("127.0.0.1", servidor.server_port)) as conexion:
+            conexion.sendall(b"POST /v1/chat/completions HTTP/1.1\r\nHost: prueba\r\n"
+                             b"Content-Length: %d\r\n\r\n" % len(cuerpo) + cuerpo)
+    # Tiempo para que el servidor intente escribir las respuestas
+    time.sleep(0.3)
+    assert errores == []
@@ -0,0 +1,32 @@
+import io
+
+import pandas as pd
+import pytest
+
+from dci import tabla_oms
+from dci.cohorte import iter_bloques, screen_cohort
+
+
+def _csv(filas):
+    return io.BytesIO(pd.DataFrame(filas).to_csv(index=False).encode())
+
+
+def test_procesa_por_bloques_y_acumula_conteos(tmp_path):
+    archivo = _csv({"edad_meses": [12, 12, 24, 24, 70], "estatura_cm": [70.0, 76.0, 80.0, 87.0, 110.0]})
+    salida = tmp_path / "salida.csv"
+    resumenes = list(screen_cohort(iter_bloques(archivo, "cohorte.csv", tamano_bloque=2),
+                                   tabla_oms.construir_who_df(), salida))
+
+    assert len(resumenes) == 3
+    final = resumenes[-1]
+    assert (final["filas"], final["riesgo"], final["normal"], final["fuera_rango"]) == (5, 2, 2, 1)
+    assert final["avance"] == pytest.approx(1.0)
+    escrito = pd.read_csv(salida)
+    assert len(escrito) == 5
+    assert escrito["dci_status"].iloc[0] == "Riesgo de Desnutrición Crónica"
+
+
+def test_sin_columna_de_estatura_falla(tmp_path):
+    archivo = _csv({"edad_meses": [12], "peso_kg": [9.0]})
+    with pytest.raises(ValueError):
+        list(screen_cohort(iter_bloques(archivo, "cohorte.csv"), None, tmp_path / "salida.csv"))
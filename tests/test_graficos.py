@@ -0,0 +1,45 @@
+import threading
+
+from dci import graficos, tabla_oms
+
+PNG = b"\x89PNG"
+
+
+def test_figura_plotly_reutiliza_las_curvas_de_referencia():
+    who_df = tabla_oms.construir_who_df()
+    primera = graficos.figura_talla_edad(who_df, 24, 85.0)
+    segunda = graficos.figura_talla_edad(who_df, [12, 36], [70.0, 95.0])
+    assert len(primera.data) == len(segunda.data) == 4
+    assert list(segunda.data[-1].x) == [12, 36]
+    assert graficos._base_plotly(who_df) is graficos._base_plotly(tabla_oms.construir_who_df())
+
+
+def _en_hilo(funcion):
+    hilo = threading.Thread(target=funcion)
+    hilo.start()
+    return hilo
+
+
+def test_matplotlib_reutiliza_las_figuras_entre_reruns():
+    grafico = graficos.GraficoMatplotlib()
+    imagenes = []
+
+    # Cada rerun de Streamlit corre en un hilo nuevo
+    for _ in range(5):
+        _en_hilo(lambda: imagenes.append(grafico.png(24, 85.0))).join()
+
+    assert grafico.creadas == 1
+    assert all(imagen.startswith(PNG) for imagen in imagenes)
+    # El marcador se limpia después de cada imagen
+    assert len(set(imagenes)) == 1
+
+
+def test_matplotlib_no_crea_mas_figuras_que_el_maximo():
+    grafico = graficos.GraficoMatplotlib(figuras_maximas=2)
+    imagenes = []
+    hilos = [_en_hilo(lambda: imagenes.append(grafico.png([12, 36], [70.0, 95.0]))) for _ in range(8)]
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(imagenes) == 8
+    assert 1 <= grafico.creadas <= 2
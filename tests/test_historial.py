@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from dci import historial
+from dci.historial import HistorialChat, _AlmacenMensajes
+
+
+def test_ventana_en_memoria_y_paginas_en_disco():
+    chat = HistorialChat(ventana=3, tamano_pagina=2)
+    for i in range(8):
+        chat.agregar("user" if i % 2 == 0 else "assistant", f"m{i}")
+
+    assert chat.en_disco == 5
+    assert [texto for _, texto in chat.recientes()] == ["m5", "m6", "m7"]
+    assert chat.anteriores(0) == []
+    assert [texto for _, texto in chat.anteriores(1)] == ["m3", "m4"]
+    assert chat.anteriores(9) == [("user", "m0"), ("assistant", "m1"), ("user", "m2"), ("assistant", "m3"), ("user", "m4")]
+
+
+@pytest.mark.parametrize("ventana", [0, -2])
+def test_ventana_minima_de_un_mensaje(ventana):
+    chat = HistorialChat(ventana=ventana)
+    chat.agregar("user", "hola")
+    chat.agregar("assistant", "¿en qué ayudo?")
+    assert chat.recientes() == [("assistant", "¿en qué ayudo?")]
+    assert chat.anteriores(1) == [("user", "hola")]
+
+
+def test_la_purga_corre_al_guardar_como_mucho_una_vez_por_periodo(tmp_path, monkeypatch):
+    almacen = _AlmacenMensajes(tmp_path / "historial.sqlite")
+    ahora = time.time()
+    almacen.guardar("nueva", 0, 0, "reciente")
+    almacen._db.execute("INSERT INTO mensajes VALUES ('vieja', 0, 0, 'antigua', ?)",
+                        (ahora - historial.RETENCION_SEGUNDOS - 1,))
+
+    # Dentro del mismo periodo no se vuelve a purgar
+    almacen.guardar("nueva", 1, 1, "otra")
+    assert almacen.leer("vieja", 0, 1) == [(0, "antigua")]
+
+    monkeypatch.setattr(historial.time, "time", lambda: ahora + historial.PURGA_CADA_SEGUNDOS + 1)
+    almacen.guardar("nueva", 2, 0, "una más")
+    assert almacen.leer("vieja", 0, 1) == []
+    assert len(almacen.leer("nueva", 0, 3)) == 3
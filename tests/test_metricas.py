@@ -0,0 +1,36 @@
+import json
+
+from dci import metricas
+
+
+def test_span_no_mide_nada_sin_rerun_activo(tmp_path):
+    ruta = tmp_path / "metricas.jsonl"
+    metricas.iniciar_rerun("prueba.py", activo=False)
+    with metricas.span("clasificacion") as tramo:
+        pass
+    assert tramo is None
+    assert not metricas.activo()
+    assert metricas.finalizar_rerun(ruta=ruta) == []
+    assert not ruta.exists()
+
+
+def test_rerun_activo_exporta_tramos_contadores_e_histogramas(tmp_path):
+    ruta = tmp_path / "metricas.jsonl"
+    metricas.contar("openai_timeouts")
+    for _ in range(2):
+        metricas.iniciar_rerun("prueba.py", activo=True)
+        with metricas.span("clasificacion"):
+            pass
+        tramos = metricas.finalizar_rerun({"hits_memoria": 3}, ruta=ruta)
+
+    assert [nombre for nombre, _ in tramos] == ["clasificacion", "total"]
+    lineas = [json.loads(linea) for linea in ruta.read_text(encoding="utf-8").splitlines()]
+    assert len(lineas) == 2
+    ultima = lineas[-1]
+    assert ultima["pagina"] == "prueba.py"
+    assert set(ultima["tramos_ms"]) == {"clasificacion", "total"}
+    assert ultima["contadores"]["hits_memoria"] == 3
+    assert ultima["contadores"]["openai_timeouts"] >= 1
+    histograma = ultima["histogramas"]["prueba.py:clasificacion"]
+    assert histograma["cantidad"] >= 2
+    assert sum(histograma["buckets"]) == histograma["cantidad"]
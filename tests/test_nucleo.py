@@ -0,0 +1,15 @@
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def test_importar_dci_no_carga_dependencias_de_la_ui():
+    codigo = (
+        "import sys, dci\n"
+        "dci.classify_dci(12, 70.0)\n"
+        "print(' '.join(m for m in ('streamlit', 'pandas', 'plotly', 'matplotlib', 'requests') if m in sys.modules))"
+    )
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    assert salida.stdout.strip() == ""
@@ -0,0 +1,64 @@
+import threading
+import time
+
+from dci import recomendaciones
+from dci.recomendaciones import Transmision, en_segundo_plano, esperar
+
+
+def _lento(fragmentos, pausa):
+    for fragmento in fragmentos:
+        time.sleep(pausa)
+        yield fragmento
+
+
+def test_guia_local_por_banda_y_estado():
+    riesgo = recomendaciones.guia_local(14, "Riesgo de Desnutrición Crónica")
+    assert riesgo == recomendaciones.guias()["12-23|riesgo"]
+    assert recomendaciones.guia_local(14, "bajo") == riesgo
+    assert recomendaciones.guia_local(14, "Normal") != riesgo
+
+
+def test_guias_de_0_a_5_meses_no_nombran_alimentos_solidos():
+    solidos = ("hígado", "carne", "lenteja", "hojas verdes", "fruta", "verdura", "aguacate", "mantequilla",
+               "comidas", "papilla", "puré", "granos")
+    for estado in ("riesgo", "normal", "otro"):
+        # La alimentación de la madre es la única línea que nombra alimentos
+        lineas = [linea for linea in recomendaciones.guias()[f"0-5|{estado}"].lower().splitlines()
+                  if not linea.startswith("- **la madre")]
+        assert not [solido for solido in solidos if any(solido in linea for linea in lineas)], estado
+    assert "hígado" in recomendaciones.guias()["6-11|riesgo"]
+
+
+def test_esperar_respeta_el_presupuesto():
+    futuro = en_segundo_plano(time.sleep, 0.3)
+    inicio = time.perf_counter()
+    assert esperar(futuro, 0.05) == (None, False)
+    assert time.perf_counter() - inicio < 0.25
+    assert esperar(futuro, 1.0) == (None, True)
+
+
+def test_transmision_muestra_el_primer_fragmento_antes_del_final():
+    transmision = Transmision()
+    futuro = en_segundo_plano(transmision.consumir, _lento(["Dar ", "huevo ", "y quinua."], 0.1))
+
+    assert transmision.esperar_inicio(futuro, 1.0)
+    assert not futuro.done()
+    assert "".join(transmision.fragmentos()) == "Dar huevo y quinua."
+    assert futuro.result(timeout=1) == "Dar huevo y quinua."
+
+
+def test_transmision_lenta_no_comienza_dentro_del_presupuesto():
+    transmision = Transmision()
+    futuro = en_segundo_plano(transmision.consumir, _lento(["tarde"], 0.3))
+    assert not transmision.esperar_inicio(futuro, 0.05)
+    # La consulta sigue y su resultado queda disponible para la caché
+    assert futuro.result(timeout=1) == "tarde"
+
+
+def test_transmision_sin_fragmentos_avisa_cuando_termina_la_consulta():
+    transmision = Transmision()
+    listo = threading.Event()
+    futuro = en_segundo_plano(lambda: listo.wait(1) and "respuesta de otra sesión")
+    listo.set()
+    assert not transmision.esperar_inicio(futuro, 1.0)
+    assert esperar(futuro, 0.0) == ("respuesta de otra sesión", True)
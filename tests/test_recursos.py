@@ -0,0 +1,64 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from dci import recursos
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def recurso_de_prueba(tmp_path):
+    archivo = tmp_path / "datos.txt"
+    archivo.write_text("uno", encoding="utf-8")
+    construcciones = []
+
+    def fabrica():
+        construcciones.append(1)
+        return archivo.read_text(encoding="utf-8")
+
+    recursos.registrar("prueba", fabrica, recursos.version_archivo(archivo))
+    yield archivo, construcciones
+    del recursos._registro["prueba"]
+
+
+def test_se_construye_una_vez_y_se_recarga_si_cambia_el_archivo(recurso_de_prueba):
+    archivo, construcciones = recurso_de_prueba
+    assert recursos.obtener("prueba") == "uno"
+    assert recursos.obtener("prueba") == "uno"
+    assert recursos.calentar(["prueba"]) == {}
+    assert len(construcciones) == 1
+
+    archivo.write_text("dos, más largo", encoding="utf-8")
+    assert recursos.verificar() == ["prueba"]
+    assert recursos.obtener("prueba") == "dos, más largo"
+    assert len(construcciones) == 2
+
+
+def test_calentar_construye_todo_y_reporta_memoria(recurso_de_prueba):
+    recursos.calentar()
+    reporte = {fila["recurso"]: fila for fila in recursos.reporte_memoria()}
+    for nombre in ("tabla_oms", "tablas_lms", "chatbot", "cache_recomendaciones", "registro_mediciones",
+                   "almacen_chat", "sesion_http", "ejecutor_recomendaciones", "prueba"):
+        assert reporte[nombre]["cargado"]
+    assert reporte["tabla_oms"]["bytes"] > 0
+
+
+def test_los_accesos_de_cada_modulo_devuelven_el_recurso_compartido():
+    from dci import cache, cliente_openai, historial, recomendaciones, registro
+
+    assert cache.cache_compartida() is recursos.obtener("cache_recomendaciones")
+    assert registro.registro_compartido() is registro.registro_compartido()
+    assert historial._almacen_compartido() is recursos.obtener("almacen_chat")
+    assert cliente_openai.sesion_compartida() is recursos.obtener("sesion_http")
+    assert recomendaciones.en_segundo_plano(lambda: 7).result(timeout=1) == 7
+
+
+def test_importar_dci_no_lee_el_archivo_env(tmp_path):
+    (tmp_path / ".env").write_text("DCI_PRUEBA_ENV=1\n", encoding="utf-8")
+    codigo = "import os, sys, dci; print('dotenv' in sys.modules, 'DCI_PRUEBA_ENV' in os.environ)"
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=tmp_path, capture_output=True, text=True, check=True,
+                            env={"PYTHONPATH": str(RAIZ)})
+    assert salida.stdout.split() == ["False", "False"]
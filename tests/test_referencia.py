@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+import pytest
+
+from dci import recursos, referencia
+
+
+@pytest.mark.parametrize("indicador, eje", [("talla_edad", 400.0), ("peso_edad", 10.5), ("peso_talla", 90.05)])
+def test_medida_para_z_es_la_inversa_de_zscore(indicador, eje):
+    sexos = np.array([referencia.SEXO_MASCULINO, referencia.SEXO_FEMENINO] * 3)
+    z = np.array([-4.0, -2.5, 0.0, 1.0, 2.5, 4.0])
+    medidas = referencia.medida_para_z(indicador, sexos, eje, z)
+    if referencia.INDICADORES[indicador][3]:
+        # Más allá de ±3 DE los indicadores de peso usan el ajuste de la OMS
+        z, medidas = z[1:-1], medidas[1:-1]
+        sexos = sexos[1:-1]
+    np.testing.assert_allclose(referencia.zscore(indicador, sexos, eje, medidas), z, atol=1e-4)
+
+
+def test_fuera_de_la_tabla_o_sexo_desconocido_da_nan():
+    z = referencia.zscore("talla_edad", [0, 0, -1], [-1.0, 10_000.0, 100.0], [50.0, 100.0, 60.0])
+    assert np.isnan(z).all()
+
+
+def test_codificar_sexo_acepta_textos_y_enteros():
+    assert referencia.codificar_sexo(["M", " niña ", "Femenino", "x"]).tolist() == [
+        referencia.SEXO_MASCULINO, referencia.SEXO_FEMENINO, referencia.SEXO_FEMENINO, -1,
+    ]
+    assert referencia.codificar_sexo([0, 1]).tolist() == [0, 1]
+
+
+def test_indicador_desconocido():
+    with pytest.raises(KeyError):
+        referencia.cargar_tabla("talla_peso")
+
+
+def test_tablas_se_recargan_al_invalidar_o_si_cambia_el_archivo():
+    tabla = referencia.cargar_tabla("talla_edad")
+    assert referencia.cargar_tabla("talla_edad") is tabla
+
+    recursos.invalidar("tablas_lms")
+    recargada = referencia.cargar_tabla("talla_edad")
+    assert recargada is not tabla
+
+    ruta = referencia.DIRECTORIO_TABLAS / "peso_edad.npy"
+    estado = os.stat(ruta)
+    try:
+        os.utime(ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1_000_000_000))
+        assert "tablas_lms" in recursos.verificar()
+        assert referencia.cargar_tabla("talla_edad") is not recargada
+    finally:
+        os.utime(ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns))
+    recursos.verificar()
@@ -0,0 +1,91 @@
+import pytest
+
+from dci.registro import RegistroMediciones
+
+
+def _tablas(registro):
+    return {
+        tabla: registro._db.execute(f"SELECT * FROM {tabla} ORDER BY 1, 2, 3").fetchall()
+        for tabla in ("prevalencia", "ultima_visita")
+    }
+
+
+def _redondear(filas):
+    return [tuple(round(v, 9) if isinstance(v, float) else v for v in fila) for fila in filas]
+
+
+@pytest.fixture
+def registro(tmp_path):
+    return RegistroMediciones(tmp_path / "registro.sqlite")
+
+
+def test_velocidad_y_cambio_de_z_con_visitas_desordenadas(registro):
+    registro.registrar_visita("A", "2024-03-01", 14, 9.6, 76.0, sexo="F")
+    registro.registrar_visita("A", "2024-01-01", 12, 9.0, 74.0, sexo="F")
+    registro.registrar_visita("A", "2024-05-01", 16, 10.0, 78.5, sexo="F")
+
+    historial = registro.historial("A")
+    assert [v["fecha"] for v in historial] == ["2024-01-01", "2024-03-01", "2024-05-01"]
+    assert historial[0]["velocidad_talla"] is None
+    assert historial[1]["velocidad_talla"] == pytest.approx(2.0 / (60 / 30.4375))
+    assert historial[2]["cambio_z_talla"] == pytest.approx(historial[2]["z_talla_edad"] - historial[1]["z_talla_edad"])
+
+
+def test_tablas_incrementales_igual_a_reconstruccion_con_visitas_atrasadas(registro):
+    registro.registrar_visita("A", "2024-06-01", 24, 11.0, 80.0, sexo="F", comunidad="Aláquez")
+    registro.registrar_visita("B", "2024-06-01", 30, 12.0, 90.0, comunidad="Mulaló")
+    # Visitas atrasadas que cambian el sexo y la comunidad registrados
+    registro.registrar_visita("A", "2024-01-01", 19, 10.0, 77.0, sexo="M", comunidad="Mulaló")
+    registro.registrar_visita("B", "2024-02-01", 26, 11.5, 86.0, sexo="F")
+    registro.registrar_visitas([
+        {"codigo": "C", "fecha": "2024-04-01", "edad_meses": 40, "peso_kg": 13.0, "estatura_cm": 88.0, "sexo": "F"},
+        {"codigo": "C", "fecha": "2023-12-01", "edad_meses": 36, "peso_kg": 12.5, "estatura_cm": 86.0,
+         "sexo": "F", "comunidad": "Aláquez"},
+    ])
+
+    incremental = _tablas(registro)
+    registro.reconstruir_prevalencia()
+    reconstruida = _tablas(registro)
+    assert _redondear(incremental["ultima_visita"]) == _redondear(reconstruida["ultima_visita"])
+    assert _redondear(incremental["prevalencia"]) == _redondear(reconstruida["prevalencia"])
+    assert registro.prevalencia(por=())[0]["n"] == 3
+    assert [g["comunidad"] for g in registro.prevalencia(por=("comunidad",))] == ["Aláquez", "Mulaló"]
+
+
+def test_cambio_de_sexo_recalcula_los_zscores(tmp_path, registro):
+    registro.registrar_visita("A", "2024-06-01", 24, 11.0, 80.0)
+    registro.registrar_visita("A", "2024-01-01", 19, 10.0, 77.0, sexo="M")
+
+    ordenado = RegistroMediciones(tmp_path / "ordenado.sqlite")
+    ordenado.registrar_visita("A", "2024-01-01", 19, 10.0, 77.0, sexo="M")
+    ordenado.registrar_visita("A", "2024-06-01", 24, 11.0, 80.0)
+    assert registro.historial("A") == ordenado.historial("A")
+    assert registro.prevalencia(por=()) == ordenado.prevalencia(por=())
+
+
+def test_prevalencia_agrupada_coincide_con_las_ultimas_visitas(registro):
+    import numpy as np
+
+    rng = np.random.default_rng(3)
+    visitas = [
+        {"codigo": f"N{i}", "fecha": f"2024-0{mes}-01", "edad_meses": int(edad) + mes, "peso_kg": 10.0,
+         "estatura_cm": float(talla) + mes, "sexo": "MF"[i % 2], "comunidad": ("Aláquez", "Mulaló")[i % 3 == 0]}
+        for i, (edad, talla) in enumerate(zip(rng.integers(0, 50, 60), rng.uniform(55, 100, 60)))
+        for mes in (1, 3)
+    ]
+    registro.registrar_visitas(visitas)
+
+    ultimas = registro._db.execute("SELECT banda_edad, z_talla_edad FROM ultima_visita").fetchall()
+    assert len(ultimas) == 60
+    total = registro.prevalencia(por=())[0]
+    z = np.array([fila[1] for fila in ultimas])
+    assert total["n_dci"] == int(np.count_nonzero(z < -2))
+    assert total["z_media"] == pytest.approx(z.mean())
+    assert total["z_de"] == pytest.approx(z.std())
+
+    por_banda = registro.prevalencia(por=("banda_edad",))
+    assert [g["banda_edad"] for g in por_banda] == sorted({b for b, _ in ultimas}, key=lambda b: int(b.split("-")[0]))
+    assert sum(g["n"] for g in por_banda) == 60
+
+    solo_mulalo = registro.prevalencia(por=("sexo",), comunidad="Mulaló")
+    assert sum(g["n"] for g in solo_mulalo) == 20
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from dci import referencia, validacion
+from dci.validacion import Validador, validar_arrays
+
+
+def _motivos(banderas):
+    return validacion.describir(banderas).tolist()
+
+
+def test_medidas_plausibles_no_se_marcan():
+    sexos = [referencia.SEXO_MASCULINO, referencia.SEXO_FEMENINO]
+    edades = np.array([12, 36])
+    dias = edades * referencia.DIAS_POR_MES
+    tallas = referencia.medida_para_z("talla_edad", sexos, dias, [-1.0, 0.5])
+    pesos = referencia.medida_para_z("peso_edad", sexos, dias, [0.0, 0.0])
+    assert validar_arrays(edades, tallas, pesos, sexos).tolist() == [0, 0]
+
+
+def test_errores_de_unidades_y_valores_faltantes():
+    banderas = validar_arrays(
+        [24, np.nan, 24, 2, 24],
+        [870.0, 80.0, 86.0, 86.0, 12.0],
+        [12.0, 10.0, 12.0, 12.0, 86.0],
+    )
+    assert banderas[0] & validacion.TALLA_EN_MM
+    assert banderas[1] & validacion.FALTANTE
+    assert banderas[2] == 0
+    assert banderas[3] & validacion.EDAD_EN_ANIOS
+    assert banderas[4] & validacion.PESO_TALLA_INTERCAMBIADOS
+
+
+def test_edades_fuera_de_0_60_o_no_enteras():
+    banderas = validar_arrays([61, 72, -1, 18.5, 60], [110.0, 115.0, 50.0, 80.0, 109.0])
+    assert _motivos(banderas[:4]) == ["edad fuera de 0-60 meses enteros"] * 4
+    assert banderas[4] == 0
+
+
+def test_zscores_lms_solo_para_filas_sin_otro_motivo(monkeypatch):
+    calculadas = []
+    zscore = referencia.zscore
+    monkeypatch.setattr(referencia, "zscore", lambda indicador, sexo, *args: calculadas.append(len(sexo)) or
+                        zscore(indicador, sexo, *args))
+    validar_arrays([24, 24, 72, 24], [86.0, 860.0, 110.0, 86.0], [12.0, 12.0, 20.0, 45.0], ["M", "M", "F", "F"])
+    # Solo las filas 0 y 3 llegan a las tablas LMS; la 3 tiene un peso imposible
+    assert set(calculadas) <= {0, 1, 2}
+    assert max(calculadas) == 2
+
+
+def test_duplicados_entre_bloques_y_reporte():
+    validador = Validador("edad_meses", "estatura_cm", col_id="codigo", col_fecha="fecha")
+    primero = pd.DataFrame({"codigo": ["A", "B", "A"], "fecha": ["2024-01-01"] * 3,
+                            "edad_meses": [24, 24, 24], "estatura_cm": [86.0, 86.0, 86.0]})
+    # El código se lee como número en un bloque y como texto en el otro
+    segundo = pd.DataFrame({"codigo": ["B", 7], "fecha": ["2024-01-01", "2024-01-01"],
+                            "edad_meses": ["24", "30"], "estatura_cm": [86.0, 91.0]})
+    tercero = pd.DataFrame({"codigo": [7], "fecha": ["2024-01-01"], "edad_meses": [30], "estatura_cm": [91.0]})
+
+    validas, cuarentena = validador.validar(primero)
+    assert validas["codigo"].tolist() == ["A", "B"]
+    assert cuarentena["motivos"].tolist() == ["visita duplicada"]
+    assert len(validador.claves_validas) == 2
+    validas, cuarentena = validador.validar(segundo)
+    assert validas["codigo"].tolist() == [7]
+    validas, cuarentena = validador.validar(tercero)
+    assert validas.empty
+
+    assert validador.reporte() == {
+        "filas": 6, "validas": 3, "cuarentena": 3,
+        "motivos": {**dict.fromkeys(validacion.MOTIVOS.values(), 0), "visita duplicada": 3},
+    }
+
+
+def test_edad_faltante_no_cuenta_como_implausible():
+    banderas = validar_arrays([np.nan, 24], [80.0, np.nan])
+    assert _motivos(banderas) == ["edad o talla faltante"] * 2
+
+
+def test_cuarentena_conserva_los_valores_originales():
+    validador = Validador("edad_meses", "estatura_cm")
+    bloque = pd.DataFrame({"edad_meses": ["abc", "24"], "estatura_cm": ["80", "86.0"]})
+    validas, cuarentena = validador.validar(bloque)
+    assert cuarentena["edad_meses"].tolist() == ["abc"]
+    assert cuarentena["motivos"].tolist() == ["edad o talla faltante"]
+    assert validas["edad_meses"].tolist() == [24.0]
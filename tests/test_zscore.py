@@ -0,0 +1,28 @@
+import numpy as np
+
+import dci
+from dci import tabla_oms
+
+
+def test_batch_coincide_con_la_version_escalar():
+    rng = np.random.default_rng(0)
+    edades = rng.integers(0, 61, 500)
+    tallas = rng.uniform(45, 115, 500).round(1)
+    _, codigos = dci.classify_dci_batch(edades, tallas)
+    estados = [dci.ESTADOS_DCI[int(c)] for c in codigos]
+    assert estados == [dci.classify_dci(int(e), t) for e, t in zip(edades, tallas)]
+
+
+def test_edades_fuera_de_la_tabla_quedan_fuera_de_rango():
+    z, codigos = dci.classify_dci_batch([-1, 12.5, 61, 24], [50.0, 75.0, 110.0, 87.0])
+    assert np.isnan(z[:3]).all()
+    assert codigos.tolist() == [dci.CODIGO_FUERA_RANGO] * 3 + [dci.CODIGO_NORMAL]
+
+
+def test_dataframe_recibe_columnas_de_estado():
+    import pandas as pd
+
+    ninos = pd.DataFrame({"age_months": [12, 12], "height_cm": [70.0, 76.0]})
+    resultado = dci.classify_dci_df(ninos, tabla_oms.construir_who_df())
+    assert resultado["dci_status"].tolist() == ["Riesgo de Desnutrición Crónica", "Normal"]
+    assert "z_score" not in ninos